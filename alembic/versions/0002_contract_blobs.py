@@ -0,0 +1,55 @@
+"""content-addressed contract blobs
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "contract_blobs",
+        sa.Column("hash", sa.String(64), primary_key=True),
+        sa.Column("compression", sa.String(8), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+    # Existing rows keep their inline source; new rows reference blobs
+    with op.batch_alter_table("contract_submissions") as batch_op:
+        batch_op.add_column(sa.Column("content_hash", sa.String(64), nullable=True))
+        batch_op.add_column(sa.Column("generated_hash", sa.String(64), nullable=True))
+        batch_op.alter_column("content", existing_type=sa.Text(), nullable=True)
+        batch_op.create_foreign_key(
+            "fk_contract_submissions_content_hash", "contract_blobs", ["content_hash"], ["hash"]
+        )
+        batch_op.create_foreign_key(
+            "fk_contract_submissions_generated_hash", "contract_blobs", ["generated_hash"], ["hash"]
+        )
+        batch_op.create_index("ix_contract_submissions_content_hash", ["content_hash"])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("contract_submissions") as batch_op:
+        batch_op.drop_index("ix_contract_submissions_content_hash")
+        batch_op.drop_constraint("fk_contract_submissions_generated_hash", type_="foreignkey")
+        batch_op.drop_constraint("fk_contract_submissions_content_hash", type_="foreignkey")
+        batch_op.alter_column("content", existing_type=sa.Text(), nullable=False)
+        batch_op.drop_column("generated_hash")
+        batch_op.drop_column("content_hash")
+
+    op.drop_table("contract_blobs")
@@ -0,0 +1,54 @@
+"""indexes for keyset-paginated listings
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("deployments") as batch_op:
+        batch_op.add_column(sa.Column("user_id", sa.Integer(), nullable=True))
+        batch_op.create_foreign_key("fk_deployments_user_id", "users", ["user_id"], ["id"])
+
+    op.execute(
+        "UPDATE deployments SET user_id = ("
+        "SELECT contract_submissions.user_id FROM contract_submissions "
+        "WHERE contract_submissions.id = deployments.submission_id)"
+    )
+
+    op.create_index("ix_contract_submissions_user_id_id", "contract_submissions", ["user_id", "id"])
+    op.create_index(
+        "ix_contract_submissions_user_id_status_id", "contract_submissions", ["user_id", "status", "id"]
+    )
+    op.create_index("ix_contract_submissions_created_at", "contract_submissions", ["created_at"])
+    op.create_index("ix_deployments_user_id_id", "deployments", ["user_id", "id"])
+    op.create_index("ix_deployments_user_id_status_id", "deployments", ["user_id", "status", "id"])
+    op.create_index("ix_deployments_submission_id_id", "deployments", ["submission_id", "id"])
+    op.create_index("ix_deployments_created_at", "deployments", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_deployments_created_at", table_name="deployments")
+    op.drop_index("ix_deployments_submission_id_id", table_name="deployments")
+    op.drop_index("ix_deployments_user_id_status_id", table_name="deployments")
+    op.drop_index("ix_deployments_user_id_id", table_name="deployments")
+    op.drop_index("ix_contract_submissions_created_at", table_name="contract_submissions")
+    op.drop_index("ix_contract_submissions_user_id_status_id", table_name="contract_submissions")
+    op.drop_index("ix_contract_submissions_user_id_id", table_name="contract_submissions")
+
+    with op.batch_alter_table("deployments") as batch_op:
+        batch_op.drop_constraint("fk_deployments_user_id", type_="foreignkey")
+        batch_op.drop_column("user_id")
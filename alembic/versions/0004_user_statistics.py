@@ -0,0 +1,46 @@
+"""per-user statistics counters
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_statistics",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("total_submissions", sa.Integer(), nullable=False),
+        sa.Column("total_deployments", sa.Integer(), nullable=False),
+        sa.Column("successful_deployments", sa.Integer(), nullable=False),
+        sa.Column("total_gas_used", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+    op.execute(
+        "INSERT INTO user_statistics "
+        "(user_id, total_submissions, total_deployments, successful_deployments, total_gas_used) "
+        "SELECT users.id, "
+        "(SELECT count(*) FROM contract_submissions WHERE contract_submissions.user_id = users.id), "
+        "count(deployments.id), "
+        "coalesce(sum(CASE WHEN deployments.status = 'DEPLOYED' THEN 1 ELSE 0 END), 0), "
+        "coalesce(sum(deployments.gas_used), 0) "
+        "FROM users LEFT JOIN deployments ON deployments.user_id = users.id "
+        "GROUP BY users.id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_statistics")
@@ -0,0 +1,59 @@
+"""analytics rollups
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("contract_submissions") as batch_op:
+        batch_op.add_column(sa.Column("generation_ms", sa.Integer(), nullable=True))
+
+    op.create_table(
+        "analytics_rollups",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("granularity", sa.String(8), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("deployments", sa.Integer(), nullable=False),
+        sa.Column("successful_deployments", sa.Integer(), nullable=False),
+        sa.Column("gas_used", sa.Integer(), nullable=False),
+        sa.Column("generations", sa.Integer(), nullable=False),
+        sa.Column("generation_ms_total", sa.Integer(), nullable=False),
+        sa.Column("generation_ms_max", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index(
+        "ix_analytics_rollups_granularity_user_id_bucket",
+        "analytics_rollups",
+        ["granularity", "user_id", "bucket_start"],
+    )
+
+    op.create_table(
+        "analytics_watermarks",
+        sa.Column("source", sa.String(), primary_key=True),
+        sa.Column("last_id", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("analytics_watermarks")
+    op.drop_index("ix_analytics_rollups_granularity_user_id_bucket", table_name="analytics_rollups")
+    op.drop_table("analytics_rollups")
+
+    with op.batch_alter_table("contract_submissions") as batch_op:
+        batch_op.drop_column("generation_ms")
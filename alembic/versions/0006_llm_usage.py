@@ -0,0 +1,40 @@
+"""llm usage
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "llm_usage",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("submission_id", sa.Integer(), sa.ForeignKey("contract_submissions.id"), nullable=True),
+        sa.Column("provider", sa.String(16), nullable=False),
+        sa.Column("model", sa.String(64), nullable=False),
+        sa.Column("prompt_tokens", sa.Integer(), nullable=False),
+        sa.Column("completion_tokens", sa.Integer(), nullable=False),
+        sa.Column("cost_microusd", sa.Integer(), nullable=False),
+        sa.Column("estimated", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_llm_usage_user_id_created_at", "llm_usage", ["user_id", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_llm_usage_user_id_created_at", table_name="llm_usage")
+    op.drop_table("llm_usage")
@@ -0,0 +1,139 @@
+"""
+Load generator for the contract generation endpoint
+Run this with: python -m benchmarks.generation_load_test --in-process
+
+--in-process serves the API router from this process with the offline mock
+LLM provider and raised quotas; the database at DATABASE_URL must already be
+migrated (alembic upgrade head). Without it, point --url at a running server,
+ideally started with LLM_MOCK_ENABLED=true so no API credits are spent.
+"""
+
+import argparse
+import asyncio
+import os
+import time
+import uuid
+from collections import Counter
+from typing import Dict, List, Optional
+import httpx
+
+PROMPTS = [
+    "Create a fungible token with minting restricted to the admin",
+    "Create an NFT collection with a public mint function",
+    "Create a staking contract that pays rewards per epoch",
+    "Create a marketplace that lists NFTs for a fixed price",
+    "Create a DAO voting contract with weighted votes",
+]
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def build_client(args) -> httpx.AsyncClient:
+    if not args.in_process:
+        return httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+
+    # Settings are read at import time, so configure them before importing the app
+    os.environ.setdefault("LLM_MOCK_ENABLED", "true")
+    os.environ.setdefault("LLM_GENERATIONS_PER_USER_PER_HOUR", "1000000000")
+    os.environ.setdefault("LLM_DAILY_TOKEN_BUDGET_PER_USER", "1000000000000")
+    os.environ.setdefault("LLM_DAILY_COST_BUDGET_USD", "1000000000")
+    from fastapi import FastAPI
+    from src.api.routes import router
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1")
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=args.timeout)
+
+async def get_token(client: httpx.AsyncClient) -> str:
+    email = f"loadtest-{uuid.uuid4().hex[:12]}@example.com"
+    password = uuid.uuid4().hex
+    response = await client.post("/api/v1/users", json={
+        "email": email,
+        "full_name": "Load Test",
+        "password": password,
+        "persona_type": "DEVELOPER"
+    })
+    response.raise_for_status()
+    response = await client.post("/api/v1/users/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+async def run(args) -> Dict[str, object]:
+    ttfbs: List[float] = []
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    next_request = iter(range(args.requests))
+
+    async with build_client(args) as client:
+        token = args.token or await get_token(client)
+
+        async def worker():
+            for index in next_request:
+                payload = {
+                    "input_type": "NATURAL_LANGUAGE",
+                    "content": PROMPTS[index % args.distinct_prompts % len(PROMPTS)] + f" (variant {index % args.distinct_prompts})",
+                    "network": "testnet"
+                }
+                started_at = time.perf_counter()
+                try:
+                    async with client.stream("POST", "/api/v1/contracts", params={"token": token}, json=payload) as response:
+                        ttfb = time.perf_counter() - started_at
+                        await response.aread()
+                except httpx.HTTPError as e:
+                    statuses[type(e).__name__] += 1
+                    continue
+                latency = time.perf_counter() - started_at
+
+                statuses[response.status_code] += 1
+                if response.status_code == 200:
+                    ttfbs.append(ttfb)
+                    latencies.append(latency)
+
+        started_at = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started_at
+
+    return {
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "statuses": dict(statuses),
+        "elapsed_seconds": elapsed,
+        "throughput_rps": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "ttfb": ttfbs,
+        "latency": latencies
+    }
+
+def report(result: Dict[str, object]):
+    print(f"requests     {result['requests']} at concurrency {result['concurrency']}")
+    print(f"statuses     {result['statuses']}")
+    print(f"elapsed      {result['elapsed_seconds']:.2f} s")
+    print(f"throughput   {result['throughput_rps']:.2f} successful req/s")
+    for label in ("ttfb", "latency"):
+        values = result[label]
+        if not values:
+            print(f"{label:<12} no successful requests")
+            continue
+        summary = "   ".join(
+            f"{name} {percentile(values, fraction) * 1000:8.1f} ms"
+            for name, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99), ("max", 1.0))
+        )
+        print(f"{label:<12} {summary}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive POST /api/v1/contracts and report latency")
+    parser.add_argument("--url", default="http://localhost:8000", help="Base URL of a running server")
+    parser.add_argument("--in-process", action="store_true", help="Serve the API in this process with the mock provider")
+    parser.add_argument("--token", help="Access token to use; a throwaway user is registered when omitted")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--distinct-prompts", type=int, default=50, help="Number of distinct prompts to cycle through")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    report(asyncio.run(run(args)))
+
+if __name__ == "__main__":
+    main()
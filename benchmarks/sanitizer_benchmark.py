@@ -0,0 +1,72 @@
+"""
+Microbenchmark for InputSanitizer on contract request payloads
+Run this with: python -m benchmarks.sanitizer_benchmark
+"""
+
+import re
+import timeit
+from typing import Any, Dict
+from src.utils.validators import InputSanitizer
+
+def legacy_sanitize_string(input_string: str) -> str:
+    sanitized = input_string.strip()
+    sanitized = re.sub(r'[<>"\']', '', sanitized)
+    sanitized = re.sub(r'\s+', ' ', sanitized)
+    return sanitized
+
+def legacy_sanitize_json_input(json_data: Dict[str, Any]) -> Dict[str, Any]:
+    sanitized = {}
+    for key, value in json_data.items():
+        if isinstance(value, str):
+            sanitized[key] = legacy_sanitize_string(value)
+        elif isinstance(value, dict):
+            sanitized[key] = legacy_sanitize_json_input(value)
+        elif isinstance(value, list):
+            sanitized[key] = [
+                legacy_sanitize_json_input(item) if isinstance(item, dict)
+                else legacy_sanitize_string(item) if isinstance(item, str)
+                else item
+                for item in value
+            ]
+        else:
+            sanitized[key] = value
+    return sanitized
+
+def build_conditions(rules: int) -> Dict[str, Any]:
+    """Build a pre/post conditions payload shaped like ContractRequest input"""
+    return {
+        "token": {
+            "name": "ExampleToken",
+            "symbol": "EXT",
+            "decimals": 8,
+            "initial_supply": "1000000.0",
+        },
+        "rules": [
+            {
+                "id": f"rule_{i}",
+                "description": f"Withdraw amount must not exceed the vault balance for account {i}",
+                "expression": f"amount <= self.balance && recipient != 0x{i:016x}",
+                "severity": "error" if i % 3 else "warning",
+                "tags": ["balance", "withdraw", f"account-{i}"],
+            }
+            for i in range(rules)
+        ],
+        "notes": "Deposits emit TokensDeposited; withdrawals emit TokensWithdrawn.\n  Admin may mint.",
+    }
+
+def main():
+    payloads = {
+        "small (10 rules)": build_conditions(10),
+        "medium (200 rules)": build_conditions(200),
+        "large (5000 rules)": build_conditions(5000),
+    }
+
+    for label, payload in payloads.items():
+        assert InputSanitizer.sanitize_json_input(payload) == legacy_sanitize_json_input(payload)
+        number = max(1, 20000 // len(payload["rules"]))
+        legacy = min(timeit.repeat(lambda: legacy_sanitize_json_input(payload), number=number, repeat=5)) / number
+        current = min(timeit.repeat(lambda: InputSanitizer.sanitize_json_input(payload), number=number, repeat=5)) / number
+        print(f"{label:<20} legacy {legacy * 1e6:10.1f} us   current {current * 1e6:10.1f} us   speedup {legacy / current:5.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+LangChain chat endpoints
+
+Mounted by the main API at /api/langchain (see src/main.py) and served on
+their own by langchain_server.py. LangChain is imported on the first chat
+request, so it costs nothing at startup. Chat requires an API access token
+and counts against the same daily budget as contract generation.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from src.config import settings
+from src.models.database import SessionLocal, get_db
+from src.models.user import User
+from src.services.chat_history import ChatHistoryManager
+from src.services.llm_service import LLMService
+from src.services.usage_service import UsageService
+from src.services.user_service import UserService
+from src.utils.prompts import prompts
+from src.utils.rate_limit import RateLimitExceeded, quotas
+from src.utils.tokens import estimate_message_tokens, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Tokens are sent in batches: a frame goes out once this many characters are
+# buffered or the oldest buffered token is this old, whichever comes first
+SSE_FLUSH_CHARS = 256
+SSE_FLUSH_INTERVAL_SECONDS = 0.05
+# Comment frame sent when nothing else was, so proxies keep the connection open
+SSE_HEARTBEAT_SECONDS = 15.0
+
+_STREAM_END = object()
+
+class ChatRequest(BaseModel):
+    messages: List[dict]
+    stream: bool = True
+    # Lets older turns be summarized once and reused on later requests
+    conversation_id: Optional[str] = None
+
+class ChatResponse(BaseModel):
+    content: str
+    type: str = "response"
+
+def sse_frame(payload: dict) -> str:
+    return f"data: {json.dumps(payload)}\n\n"
+
+async def stream_sse(request: Request, tokens: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Relay tokens as micro-batched SSE frames with heartbeats
+
+    The upstream iterator runs in its own task feeding a queue, so heartbeats
+    and disconnect checks happen even while the model is silent. When the
+    client goes away the upstream task is cancelled, which stops generation.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def pump():
+        try:
+            async for token in tokens:
+                await queue.put(token)
+        except Exception as e:
+            await queue.put(e)
+        await queue.put(_STREAM_END)
+
+    producer = asyncio.create_task(pump())
+    buffer: List[str] = []
+    buffered_chars = 0
+    flush_at = None
+    last_frame_at = time.monotonic()
+
+    try:
+        while True:
+            now = time.monotonic()
+            deadline = flush_at if flush_at is not None else last_frame_at + SSE_HEARTBEAT_SECONDS
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout=max(0.0, deadline - now))
+            except asyncio.TimeoutError:
+                item = None
+
+            if isinstance(item, str) and item:
+                buffer.append(item)
+                buffered_chars += len(item)
+                if flush_at is None:
+                    flush_at = time.monotonic() + SSE_FLUSH_INTERVAL_SECONDS
+
+            finished = item is _STREAM_END or isinstance(item, Exception)
+            now = time.monotonic()
+            if buffer and (finished or buffered_chars >= SSE_FLUSH_CHARS or now >= flush_at):
+                if await request.is_disconnected():
+                    break
+                yield sse_frame({"content": "".join(buffer)})
+                buffer.clear()
+                buffered_chars = 0
+                flush_at = None
+                last_frame_at = now
+            elif item is None and not buffer:
+                if await request.is_disconnected():
+                    break
+                yield ": heartbeat\n\n"
+                last_frame_at = now
+
+            if isinstance(item, Exception):
+                yield sse_frame({"error": str(item)})
+                break
+            if item is _STREAM_END:
+                yield sse_frame({"type": "done"})
+                break
+    finally:
+        producer.cancel()
+
+class ChatModel:
+    """The LangChain chat model, built on first use over the LLMService's OpenAI clients"""
+
+    def __init__(self, llm_service: LLMService):
+        self.llm_service = llm_service
+        self._llm = None
+
+    def get(self):
+        if self._llm is None:
+            from langchain_openai import ChatOpenAI
+
+            options = {}
+            # The mock provider has no SDK clients; LangChain then makes its own
+            if self.llm_service.openai_client is not None:
+                options["client"] = self.llm_service.openai_client.chat.completions
+                options["async_client"] = self.llm_service.async_openai_client.chat.completions
+            self._llm = ChatOpenAI(
+                model_name=settings.CHAT_MODEL,
+                temperature=settings.CHAT_TEMPERATURE,
+                streaming=True,
+                openai_api_key=settings.OPENAI_API_KEY,
+                **options
+            )
+        return self._llm
+
+def chat_usage(messages: list, content: str, usage_metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """A UsageService record for one chat model call, estimated when LangChain reports no usage"""
+    if usage_metadata:
+        prompt_tokens = usage_metadata.get("input_tokens", 0)
+        completion_tokens = usage_metadata.get("output_tokens", 0)
+        estimated = False
+    else:
+        prompt_tokens = estimate_message_tokens([{"content": message.content} for message in messages], settings.CHAT_MODEL)
+        completion_tokens = estimate_tokens(content, settings.CHAT_MODEL)
+        estimated = True
+    return {
+        "provider": "OPENAI",
+        "model": settings.CHAT_MODEL,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "estimated": estimated
+    }
+
+def create_chat_app(llm_service: Optional[LLMService] = None) -> FastAPI:
+    """Build the chat sub-application, sharing llm_service's clients when given"""
+    app = FastAPI(title="Smart Contract LangChain API")
+    chat_model = ChatModel(llm_service or LLMService())
+    chat_history = ChatHistoryManager()
+    chat_quota = quotas.get("chat_requests_per_minute", settings.CHAT_REQUESTS_PER_MINUTE, 60)
+    user_service = UserService()
+    usage_service = UsageService()
+
+    def authenticate(token: str, db: Session) -> User:
+        payload = user_service.verify_token(token)
+        user = None
+        if payload is not None and payload.get("sub") is not None:
+            user = user_service.get_user_by_id(db, payload["sub"])
+        if user is None or not user.is_active:
+            raise HTTPException(
+                status_code=401,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"}
+            )
+        return user
+
+    def record_usage(user_id: int, usage: Dict[str, Any]):
+        # Streams outlive the request's session, so usage gets its own
+        db = SessionLocal()
+        try:
+            usage_service.record(db, user_id, usage)
+            db.commit()
+        except Exception as e:
+            logger.error(f"Failed to record chat usage: {e}")
+            db.rollback()
+        finally:
+            db.close()
+
+    @app.post("/chat")
+    async def chat_with_langchain(
+        request: ChatRequest,
+        http_request: Request,
+        token: str,
+        db: Session = Depends(get_db)
+    ):
+        user_id = authenticate(token, db).id
+        retry_after = chat_quota.acquire(user_id)
+        if retry_after:
+            raise HTTPException(
+                status_code=429,
+                detail="Rate limit exceeded",
+                headers={"Retry-After": str(math.ceil(retry_after))}
+            )
+        try:
+            usage_service.check_budget(db, user_id)
+        except RateLimitExceeded as e:
+            raise HTTPException(
+                status_code=429,
+                detail=str(e),
+                headers={"Retry-After": str(math.ceil(e.retry_after))}
+            )
+
+        try:
+            if not settings.OPENAI_API_KEY:
+                raise HTTPException(status_code=500, detail="OpenAI API key not configured")
+
+            from langchain.schema import AIMessage, HumanMessage, SystemMessage
+            llm = chat_model.get()
+
+            async def summarize(prompt: str) -> str:
+                summary_messages = [HumanMessage(content=prompt)]
+                response = await llm.ainvoke(summary_messages)
+                record_usage(user_id, chat_usage(summary_messages, response.content, getattr(response, "usage_metadata", None)))
+                return response.content
+
+            # Trim history to the token budget, summarizing older turns
+            summary, turns = await chat_history.prepare(request.messages, request.conversation_id, summarize, owner=user_id)
+
+            # Create LangChain messages
+            langchain_messages = [SystemMessage(content=prompts.get("cadence_system").render())]
+            if summary:
+                langchain_messages.append(SystemMessage(content=f"Summary of the earlier conversation:\n{summary}"))
+
+            for msg in turns:
+                message_class = HumanMessage if msg["role"] == "user" else AIMessage
+                langchain_messages.append(message_class(content=msg["content"]))
+
+            # Generate response
+            if request.stream:
+                # For streaming response
+                async def generate_tokens():
+                    content = []
+                    usage_metadata = None
+                    try:
+                        async for chunk in llm.astream(langchain_messages):
+                            usage_metadata = getattr(chunk, "usage_metadata", None) or usage_metadata
+                            if chunk.content:
+                                content.append(chunk.content)
+                                yield chunk.content
+                    finally:
+                        # Also when the client disconnects: the tokens were spent
+                        record_usage(user_id, chat_usage(langchain_messages, "".join(content), usage_metadata))
+
+                return StreamingResponse(
+                    stream_sse(http_request, generate_tokens()),
+                    media_type="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "Connection": "keep-alive", "X-Accel-Buffering": "no"}
+                )
+            else:
+                # For non-streaming response
+                response = await llm.ainvoke(langchain_messages)
+                record_usage(user_id, chat_usage(langchain_messages, response.content, getattr(response, "usage_metadata", None)))
+                return ChatResponse(content=response.content)
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"LangChain API error: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+    @app.get("/health")
+    async def health_check():
+        return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+
+    return app
@@ -0,0 +1,141 @@
+import json
+from typing import Any, Dict, Optional, Tuple, Union
+from src.config import settings
+from src.utils.helpers import TTLCache
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Encodings a WebSocket client can negotiate, json is always available
+SUPPORTED_ENCODINGS = ("json", "msgpack") if msgpack is not None else ("json",)
+
+def dumps_json(data: Any) -> str:
+    """Serialize data to compact JSON, using orjson when installed"""
+    if orjson is not None:
+        # Like json.dumps, accept int and other non-string dict keys
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(data, separators=(",", ":"), default=str)
+
+def loads_json(data: Union[str, bytes]) -> Any:
+    """Parse JSON, using orjson when installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+class EncodedMessage:
+    """A WebSocket event serialized at most once per encoding
+
+    Fan-out reuses the cached text/binary frames for every recipient instead of
+    serializing the event again for each socket.
+    """
+
+    __slots__ = ("_event", "_text", "_binary")
+
+    def __init__(self, event: Optional[Dict[str, Any]] = None, text: Optional[str] = None):
+        if event is None and text is None:
+            raise ValueError("EncodedMessage needs an event or its JSON text")
+        self._event = event
+        self._text = text
+        self._binary = None
+
+    @property
+    def event(self) -> Dict[str, Any]:
+        if self._event is None:
+            self._event = loads_json(self._text)
+        return self._event
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = dumps_json(self._event)
+        return self._text
+
+    @property
+    def binary(self) -> bytes:
+        if self._binary is None:
+            if msgpack is None:
+                raise RuntimeError("msgpack is not installed")
+            self._binary = msgpack.packb(self.event, default=str)
+        return self._binary
+
+    def frame(self, encoding: str) -> Union[str, bytes]:
+        """Return the frame payload for a connection using encoding"""
+        return self.binary if encoding == "msgpack" else self.text
+
+def as_encoded(message: Union[str, Dict[str, Any], EncodedMessage]) -> EncodedMessage:
+    """Wrap a JSON string or event dict as an EncodedMessage"""
+    if isinstance(message, EncodedMessage):
+        return message
+    if isinstance(message, str):
+        return EncodedMessage(text=message)
+    return EncodedMessage(event=message)
+
+class TokenDeltaEncoder:
+    """Turns cumulative streamed content into append-only deltas
+
+    Producers pass the full text generated so far; only the new suffix is sent
+    along with its offset. If the content no longer extends what was sent
+    (e.g. a retry restarted the stream) a full reset frame is emitted.
+    Streams that never finish expire after the TTL.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_streams: Optional[int] = None):
+        self.sent = TTLCache(
+            ttl_seconds or settings.WS_STREAM_TTL_SECONDS,
+            max_size=max_streams or settings.WS_MAX_STREAMS
+        )
+
+    def encode(self, stream_id: str, content: str) -> Dict[str, Any]:
+        previous = self.sent.get(stream_id) or ""
+        self.sent.set(stream_id, content)
+        if previous and content.startswith(previous):
+            return {"offset": len(previous), "delta": content[len(previous):]}
+        return {"offset": 0, "delta": content, "reset": bool(previous)}
+
+    def finish(self, stream_id: str):
+        self.sent.invalidate(stream_id)
+
+class TokenDeltaDecoder:
+    """Rebuilds the full text of delta-encoded streams from the frames passing by
+
+    Used on the delivering side so a socket that joins mid-stream can be sent
+    a snapshot of everything so far instead of a delta it cannot apply.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_streams: Optional[int] = None):
+        self.texts = TTLCache(
+            ttl_seconds or settings.WS_STREAM_TTL_SECONDS,
+            max_size=max_streams or settings.WS_MAX_STREAMS
+        )
+
+    def apply(self, stream_id: str, offset: int, delta: str) -> Optional[str]:
+        """Return the stream's full text after this frame, or None if its start was missed"""
+        if offset == 0:
+            text = delta
+        else:
+            previous = self.texts.get(stream_id)
+            if previous is None or len(previous) != offset:
+                self.texts.invalidate(stream_id)
+                return None
+            text = previous + delta
+        self.texts.set(stream_id, text)
+        return text
+
+    def finish(self, stream_id: str):
+        self.texts.invalidate(stream_id)
+
+def split_envelope(envelope: str) -> Tuple[Dict[str, Any], str]:
+    """Split a pub/sub envelope into its routing header and the event JSON"""
+    header, _, event_text = envelope.partition("\n")
+    return loads_json(header), event_text
+
+def build_envelope(header: Dict[str, Any], message: EncodedMessage) -> str:
+    """Prefix the already serialized event with a one-line routing header"""
+    return dumps_json(header) + "\n" + message.text
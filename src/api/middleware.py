@@ -1,6 +1,8 @@
 from fastapi import Request, Response
 from fastapi.middleware.base import BaseHTTPMiddleware
 from src.config import settings
+from src.utils.rate_limit import GCRARateLimiter
+import math
 import time
 import logging
 
@@ -10,32 +12,20 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
     def __init__(self, app, calls_per_minute: int = 60):
         super().__init__(app)
         self.calls_per_minute = calls_per_minute
-        self.call_timestamps = {}
+        self.limiter = GCRARateLimiter(calls_per_minute, 60, name="api_calls_per_minute")
 
     async def dispatch(self, request: Request, call_next):
         client_ip = request.client.host
-        current_time = time.time()
 
-        # Clean up old timestamps (older than 1 minute)
-        if client_ip in self.call_timestamps:
-            self.call_timestamps[client_ip] = [
-                timestamp for timestamp in self.call_timestamps[client_ip]
-                if current_time - timestamp < 60
-            ]
-
-        # Check if rate limit exceeded
-        if client_ip in self.call_timestamps and len(self.call_timestamps[client_ip]) >= self.calls_per_minute:
+        retry_after = self.limiter.acquire(client_ip)
+        if retry_after:
             return Response(
                 content="Rate limit exceeded",
                 status_code=429,
-                media_type="text/plain"
+                media_type="text/plain",
+                headers={"Retry-After": str(math.ceil(retry_after))}
             )
 
-        # Record this call
-        if client_ip not in self.call_timestamps:
-            self.call_timestamps[client_ip] = []
-        self.call_timestamps[client_ip].append(current_time)
-
         response = await call_next(request)
         return response
 
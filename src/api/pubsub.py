@@ -0,0 +1,197 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, List, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+MessageHandler = Callable[[str, str], Awaitable[None]]
+
+class PubSubBackend(ABC):
+    """Base class for delivering WebSocket events across worker processes"""
+
+    @abstractmethod
+    async def start(self, channel: str, handler: MessageHandler):
+        """Subscribe to channel and invoke handler(channel, message) for every message"""
+
+    @abstractmethod
+    async def publish(self, channel: str, message: str):
+        """Publish message to every subscriber of channel"""
+
+    @abstractmethod
+    async def stop(self):
+        """Release connections and stop listening"""
+
+class InProcessPubSub(PubSubBackend):
+    """Single-process backend, used when only one worker is running"""
+
+    def __init__(self):
+        self.handlers = {}
+
+    async def start(self, channel: str, handler: MessageHandler):
+        self.handlers.setdefault(channel, []).append(handler)
+
+    async def publish(self, channel: str, message: str):
+        for handler in list(self.handlers.get(channel, [])):
+            try:
+                await handler(channel, message)
+            except Exception as e:
+                logger.error(f"Pub/sub handler failed on {channel}: {str(e)}")
+
+    async def stop(self):
+        self.handlers = {}
+
+class RESPConnection:
+    """Minimal client for the Redis serialization protocol (RESP2)"""
+
+    def __init__(self, url: str):
+        self.url = urlparse(url)
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def open(self):
+        if self.url.scheme == "unix":
+            self.reader, self.writer = await asyncio.open_unix_connection(self.url.path)
+        else:
+            self.reader, self.writer = await asyncio.open_connection(
+                self.url.hostname or "localhost",
+                self.url.port or 6379
+            )
+        if self.url.password:
+            if self.url.username:
+                await self.command("AUTH", self.url.username, self.url.password)
+            else:
+                await self.command("AUTH", self.url.password)
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except Exception:
+                pass
+        self.reader = None
+        self.writer = None
+
+    @staticmethod
+    def encode_command(*args: str) -> bytes:
+        """Encode a command as a RESP array of bulk strings"""
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg.encode("utf-8") if isinstance(arg, str) else arg
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(parts)
+
+    async def send(self, *args: str):
+        self.writer.write(self.encode_command(*args))
+        await self.writer.drain()
+
+    async def command(self, *args: str):
+        await self.send(*args)
+        return await self.read_reply()
+
+    async def read_reply(self):
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("Pub/sub server closed the connection")
+
+        prefix, payload = line[:1], line[1:-2]
+        if prefix == b"+":
+            return payload.decode("utf-8")
+        if prefix == b"-":
+            raise ConnectionError(payload.decode("utf-8"))
+        if prefix == b":":
+            return int(payload)
+        if prefix == b"$":
+            length = int(payload)
+            if length == -1:
+                return None
+            data = await self.reader.readexactly(length + 2)
+            return data[:-2]
+        if prefix == b"*":
+            length = int(payload)
+            if length == -1:
+                return None
+            return [await self.read_reply() for _ in range(length)]
+
+        raise ConnectionError(f"Unexpected pub/sub reply: {line!r}")
+
+class RedisPubSub(PubSubBackend):
+    """Backend speaking the Redis protocol over TCP or a unix socket
+
+    Works against Redis itself or any server implementing PUBLISH/SUBSCRIBE,
+    e.g. redis://localhost:6379/0 or unix:///var/run/redis.sock
+    """
+
+    def __init__(self, url: str, reconnect_delay: float = 1.0):
+        self.url = url
+        self.reconnect_delay = reconnect_delay
+        self.publisher = RESPConnection(url)
+        self.publish_lock = asyncio.Lock()
+        self.listeners: List[asyncio.Task] = []
+
+    async def start(self, channel: str, handler: MessageHandler):
+        ready = asyncio.get_running_loop().create_future()
+        self.listeners.append(asyncio.create_task(self._listen(channel, handler, ready)))
+        await ready
+
+    async def _listen(self, channel: str, handler: MessageHandler, ready: asyncio.Future):
+        while True:
+            connection = RESPConnection(self.url)
+            try:
+                await connection.open()
+                await connection.send("SUBSCRIBE", channel)
+                while True:
+                    reply = await connection.read_reply()
+                    if not isinstance(reply, list) or not reply:
+                        continue
+                    kind = reply[0]
+                    if kind == b"subscribe" and not ready.done():
+                        ready.set_result(True)
+                    elif kind == b"message":
+                        try:
+                            await handler(reply[1].decode("utf-8"), reply[2].decode("utf-8"))
+                        except Exception as e:
+                            logger.error(f"Pub/sub handler failed on {channel}: {str(e)}")
+            except asyncio.CancelledError:
+                await connection.close()
+                raise
+            except (OSError, ConnectionError, asyncio.IncompleteReadError) as e:
+                logger.warning(f"Pub/sub subscriber lost connection: {str(e)}")
+                if not ready.done():
+                    ready.set_exception(e)
+                    await connection.close()
+                    return
+            await connection.close()
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def publish(self, channel: str, message: str):
+        async with self.publish_lock:
+            for attempt in range(2):
+                try:
+                    if self.publisher.writer is None:
+                        await self.publisher.open()
+                    await self.publisher.command("PUBLISH", channel, message)
+                    return
+                except (OSError, ConnectionError, asyncio.IncompleteReadError):
+                    await self.publisher.close()
+                    if attempt:
+                        raise
+
+    async def stop(self):
+        for task in self.listeners:
+            task.cancel()
+        await asyncio.gather(*self.listeners, return_exceptions=True)
+        self.listeners = []
+        async with self.publish_lock:
+            await self.publisher.close()
+
+def create_pubsub_backend(url: str) -> PubSubBackend:
+    """Create the pub/sub backend configured by PUBSUB_URL"""
+    scheme = urlparse(url).scheme if url else "memory"
+    if scheme in ("", "memory"):
+        return InProcessPubSub()
+    if scheme in ("redis", "unix"):
+        return RedisPubSub(url)
+    raise ValueError(f"Unsupported pub/sub backend: {url}")
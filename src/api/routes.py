@@ -1,23 +1,43 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Request, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from src.models.database import get_db
+from src.models.database import get_db, SessionLocal
 from src.services.user_service import UserService
-from src.services.llm_service import LLMService
+from src.services.llm_service import LLMService, ContractValidationError
 from src.services.flow_service import FlowService
 from src.services.learning_service import LearningService
+from src.services.validation_service import ValidationService, validate_contract_source
+from src.services.blob_service import BlobService
+from src.services.statistics_service import StatisticsService
+from src.services.analytics_service import AnalyticsService
+from src.services.usage_service import UsageService
 from src.models.user import User
-from src.models.contract import ContractSubmission, Deployment
+from src.models.contract import ContractSubmission, ContractConfiguration, Deployment
+from src.models.usage import LLMUsage
+from src.utils.helpers import FileUtils, StreamingUploadReader, UploadTooLargeError, ResponseFormatter
+from src.utils.rate_limit import RateLimitExceeded
+from src.config import settings
 from pydantic import BaseModel
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, AsyncIterator
+import asyncio
 import json
+import math
+import time
+import zipfile
+from datetime import datetime
 
 router = APIRouter()
 
 # Initialize services
 user_service = UserService()
-llm_service = LLMService()
-flow_service = FlowService()
 learning_service = LearningService()
+llm_service = LLMService(learning_service)
+flow_service = FlowService()
+validation_service = ValidationService()
+blob_service = BlobService()
+statistics_service = StatisticsService()
+analytics_service = AnalyticsService()
+usage_service = UsageService()
 
 # Pydantic models for request/response
 class UserCreate(BaseModel):
@@ -37,6 +57,16 @@ class ContractRequest(BaseModel):
     post_conditions: Optional[Dict[str, Any]] = None
     network: str = "testnet"
 
+class BatchGenerationRequest(BaseModel):
+    requests: List[ContractRequest]
+
+class ContractSource(BaseModel):
+    name: str
+    content: str
+
+class BatchValidationRequest(BaseModel):
+    contracts: List[ContractSource]
+
 class DeployRequest(BaseModel):
     network: str = "testnet"
     config_id: Optional[str] = None
@@ -92,6 +122,13 @@ async def login_user(user_data: UserLogin, db: Session = Depends(get_db)):
     access_token = user_service.create_access_token(data={"sub": str(user.id)})
     return {"access_token": access_token, "token_type": "bearer"}
 
+def _rate_limited(error: RateLimitExceeded) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail=str(error),
+        headers={"Retry-After": str(math.ceil(error.retry_after))}
+    )
+
 # Contract Generation endpoints
 @router.post("/contracts")
 async def generate_contract(
@@ -102,76 +139,361 @@ async def generate_contract(
     current_user = await get_current_user(token, db)
 
     try:
+        usage_service.check_budget(db, current_user.id)
+
         # Generate contract using LLM
-        generated_contract = await llm_service.generate_contract(
+        started_at = time.perf_counter()
+        generation = await llm_service.generate(
             prompt=contract_data.content,
-            context={
-                "pre_conditions": contract_data.pre_conditions,
-                "post_conditions": contract_data.post_conditions,
-                "network": contract_data.network
-            }
-        )
-
-        # Save submission to database
-        submission = ContractSubmission(
+            context=_generation_context(contract_data),
             user_id=current_user.id,
-            input_type=contract_data.input_type,
-            content=contract_data.content,
-            generated_contract=generated_contract,
-            pre_conditions=contract_data.pre_conditions,
-            post_conditions=contract_data.post_conditions,
-            network=contract_data.network,
-            status="GENERATED"
+            db=db,
+            validate=True
         )
+        generation_ms = int((time.perf_counter() - started_at) * 1000)
+        # Only the extracted, validated contract is stored and later deployed
+        generated_contract = generation["code"]
 
-        db.add(submission)
+        # Save submission to database
+        submission = _add_generated_submission(db, current_user.id, contract_data, generated_contract, generation_ms)
+        db.flush()
+        submission_id = submission.id
+        usage = usage_service.record(db, current_user.id, generation, submission_id=submission_id)
+        cost_microusd = usage.cost_microusd
+        statistics_service.record_submission(db, current_user.id)
         db.commit()
-        db.refresh(submission)
 
         return {
-            "submission_id": submission.id,
+            "submission_id": submission_id,
             "generated_contract": generated_contract,
+            "validation": generation["validation"],
+            "repair_attempts": generation["repair_attempts"],
+            "usage": {
+                "prompt_tokens": generation["prompt_tokens"],
+                "completion_tokens": generation["completion_tokens"],
+                "cost_usd": cost_microusd / 1_000_000
+            },
             "status": "success"
         }
 
+    except ContractValidationError as e:
+        # Nothing is stored, but the tokens were spent
+        usage_service.record(db, current_user.id, e.generation)
+        db.commit()
+        raise HTTPException(status_code=422, detail={"message": str(e), "errors": e.errors})
+    except RateLimitExceeded as e:
+        raise _rate_limited(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/contracts/file")
-async def upload_contract_file(
-    file: UploadFile = File(...),
-    token: str = None,
+def _generation_context(contract_data: ContractRequest) -> Dict[str, Any]:
+    return {
+        "pre_conditions": contract_data.pre_conditions,
+        "post_conditions": contract_data.post_conditions,
+        "network": contract_data.network
+    }
+
+def _add_generated_submission(
+    db: Session,
+    user_id: int,
+    contract_data: ContractRequest,
+    generated_contract: str,
+    generation_ms: int
+) -> ContractSubmission:
+    submission = ContractSubmission(
+        user_id=user_id,
+        input_type=contract_data.input_type,
+        content_hash=blob_service.put(db, contract_data.content),
+        generated_hash=blob_service.put(db, generated_contract),
+        pre_conditions=contract_data.pre_conditions,
+        post_conditions=contract_data.post_conditions,
+        network=contract_data.network,
+        status="GENERATED",
+        generation_ms=generation_ms
+    )
+    db.add(submission)
+    return submission
+
+@router.post("/contracts/batch")
+async def generate_contracts_batch(
+    batch_data: BatchGenerationRequest,
+    token: str,
     db: Session = Depends(get_db)
 ):
-    if not file.filename.endswith(('.cdc', '.sol')):
+    """Generate many contracts, streaming one NDJSON line per item as it finishes
+
+    Items run GENERATION_BATCH_CONCURRENCY at a time, spread round-robin over
+    the healthy providers. Each item checks the daily budget before it starts
+    and commits its submission and usage as soon as it finishes, so a client
+    that disconnects midway still pays for what was generated. The final
+    "summary" line maps item indexes to submission ids.
+    """
+    current_user = await get_current_user(token, db)
+    if not batch_data.requests:
+        raise HTTPException(status_code=400, detail="Batch is empty")
+    if len(batch_data.requests) > settings.MAX_BATCH_GENERATIONS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch exceeds the maximum of {settings.MAX_BATCH_GENERATIONS} requests"
+        )
+
+    try:
+        usage_service.check_budget(db, current_user.id)
+    except RateLimitExceeded as e:
+        raise _rate_limited(e)
+
+    results = _stream_batch_generation(current_user.id, batch_data.requests)
+    return StreamingResponse(
+        (json.dumps(result) + "\n" async for result in results),
+        media_type="application/x-ndjson"
+    )
+
+async def _stream_batch_generation(user_id: int, requests: List[ContractRequest]) -> AsyncIterator[Dict[str, Any]]:
+    # The request's session may be closed before the stream finishes
+    db = SessionLocal()
+    semaphore = asyncio.Semaphore(settings.GENERATION_BATCH_CONCURRENCY)
+    providers = llm_service.router.healthy()
+    started_at = time.perf_counter()
+
+    async def run(index: int, contract_data: ContractRequest) -> Dict[str, Any]:
+        async with semaphore:
+            item_started_at = time.perf_counter()
+            try:
+                # Earlier items may have used up the budget since the batch started
+                usage_service.check_budget(db, user_id)
+                generation = await llm_service.generate(
+                    prompt=contract_data.content,
+                    provider=providers[index % len(providers)] if providers else None,
+                    context=_generation_context(contract_data),
+                    user_id=user_id,
+                    db=db,
+                    validate=True
+                )
+            except ContractValidationError as e:
+                # Nothing is stored, but the tokens were spent
+                usage_service.record(db, user_id, e.generation)
+                db.commit()
+                return {"type": "result", "index": index, "status": "invalid", "error": str(e), "errors": e.errors}
+            except RateLimitExceeded as e:
+                return {
+                    "type": "result",
+                    "index": index,
+                    "status": "rate_limited",
+                    "error": str(e),
+                    "retry_after": math.ceil(e.retry_after)
+                }
+            except Exception as e:
+                return {"type": "result", "index": index, "status": "error", "error": str(e)}
+
+            generation_ms = int((time.perf_counter() - item_started_at) * 1000)
+            # Written synchronously, with no await in between, so items sharing
+            # the session never interleave inside a transaction
+            try:
+                submission = _add_generated_submission(db, user_id, contract_data, generation["code"], generation_ms)
+                db.flush()
+                usage = usage_service.record(db, user_id, generation, submission_id=submission.id)
+                statistics_service.record_submission(db, user_id)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                return {"type": "result", "index": index, "status": "error", "error": str(e)}
+
+            return {
+                "type": "result",
+                "index": index,
+                "status": "success",
+                "submission_id": submission.id,
+                "generated_contract": generation["code"],
+                "validation": generation["validation"],
+                "repair_attempts": generation["repair_attempts"],
+                "provider": generation["provider"],
+                "usage": {
+                    "prompt_tokens": generation["prompt_tokens"],
+                    "completion_tokens": generation["completion_tokens"],
+                    "cost_usd": usage.cost_microusd / 1_000_000
+                },
+                "generation_ms": generation_ms
+            }
+
+    tasks = [asyncio.ensure_future(run(index, contract_data)) for index, contract_data in enumerate(requests)]
+    submission_ids = []
+    try:
+        for future in asyncio.as_completed(tasks):
+            result = await future
+            if result["status"] == "success":
+                submission_ids.append({"index": result["index"], "submission_id": result["submission_id"]})
+            yield result
+
+        submission_ids.sort(key=lambda item: item["index"])
+        yield {
+            "type": "summary",
+            "total": len(requests),
+            "succeeded": len(submission_ids),
+            "failed": len(requests) - len(submission_ids),
+            "submissions": submission_ids,
+            "elapsed_seconds": round(time.perf_counter() - started_at, 4)
+        }
+    except Exception as e:
+        yield {"type": "error", "error": str(e)}
+    finally:
+        for task in tasks:
+            task.cancel()
+        db.close()
+
+async def _iter_upload_chunks(file: UploadFile) -> AsyncIterator[bytes]:
+    while True:
+        chunk = await file.read(settings.UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        yield chunk
+
+async def _save_uploaded_contract(
+    filename: str,
+    chunks: AsyncIterator[bytes],
+    token: Optional[str],
+    db: Session
+) -> Dict[str, Any]:
+    if not FileUtils.is_valid_contract_file(filename or ""):
         raise HTTPException(status_code=400, detail="Only .cdc and .sol files are supported")
 
+    user_id = 1 if not token else (await get_current_user(token, db)).id
+
+    # Size, encoding and binary content are checked chunk by chunk, so an
+    # oversized or non-text upload is rejected before it is fully read
+    reader = StreamingUploadReader(settings.MAX_UPLOAD_SIZE)
     try:
-        content = await file.read()
-        contract_code = content.decode('utf-8')
+        contract_code = await reader.read(chunks)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid contract file: {str(e)}")
+
+    existing = db.query(ContractSubmission.id).filter(
+        ContractSubmission.user_id == user_id,
+        ContractSubmission.input_type == "FILE_UPLOAD",
+        ContractSubmission.content_hash == reader.content_hash
+    ).first()
+    if existing:
+        return {
+            "submission_id": existing.id,
+            "message": "Contract already uploaded",
+            "duplicate": True
+        }
 
-        # Save submission to database
+    validation = validate_contract_source(filename, contract_code)
+    if not validation["is_valid"]:
+        raise HTTPException(status_code=422, detail={
+            "message": "Contract failed validation",
+            "errors": validation["errors"],
+            "warnings": validation["warnings"]
+        })
+
+    try:
+        # Save submission to database; the uploaded source is both the
+        # content and the contract, so one blob carries two references
+        content_hash = blob_service.put(db, contract_code, references=2)
         submission = ContractSubmission(
-            user_id=1 if not token else (await get_current_user(token, db)).id,
+            user_id=user_id,
             input_type="FILE_UPLOAD",
-            content=contract_code,
-            generated_contract=contract_code,
+            content_hash=content_hash,
+            generated_hash=content_hash,
             network="testnet",
             status="UPLOADED"
         )
 
         db.add(submission)
+        statistics_service.record_submission(db, user_id)
         db.commit()
         db.refresh(submission)
 
         return {
             "submission_id": submission.id,
-            "message": "Contract uploaded successfully"
+            "message": "Contract uploaded successfully",
+            "duplicate": False,
+            "warnings": validation["warnings"]
         }
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/contracts/file")
+async def upload_contract_file(
+    file: UploadFile = File(...),
+    token: str = None,
+    db: Session = Depends(get_db)
+):
+    if file.size is not None and file.size > settings.MAX_UPLOAD_SIZE:
+        raise HTTPException(status_code=413, detail=f"Upload exceeds the maximum size of {settings.MAX_UPLOAD_SIZE} bytes")
+
+    return await _save_uploaded_contract(file.filename, _iter_upload_chunks(file), token, db)
+
+@router.put("/contracts/file/stream")
+async def stream_contract_file(
+    request: Request,
+    filename: str,
+    token: str = None,
+    db: Session = Depends(get_db)
+):
+    """Upload a contract as the raw request body, read straight off the socket"""
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > settings.MAX_UPLOAD_SIZE:
+        raise HTTPException(status_code=413, detail=f"Upload exceeds the maximum size of {settings.MAX_UPLOAD_SIZE} bytes")
+
+    return await _save_uploaded_contract(filename, request.stream(), token, db)
+
+# Batch validation endpoints
+def _stream_validation_results(contracts: List[tuple]) -> StreamingResponse:
+    if not contracts:
+        raise HTTPException(status_code=400, detail="No .cdc or .sol contracts provided")
+    if len(contracts) > settings.MAX_BATCH_CONTRACTS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.MAX_BATCH_CONTRACTS} contracts per batch")
+
+    async def generate_results():
+        async for result in validation_service.validate_batch(contracts):
+            yield json.dumps(result) + "\n"
+
+    return StreamingResponse(generate_results(), media_type="application/x-ndjson")
+
+@router.post("/contracts/validate/batch")
+async def validate_contracts_batch(
+    batch_data: BatchValidationRequest,
+    token: str,
+    db: Session = Depends(get_db)
+):
+    await get_current_user(token, db)
+    total_size = sum(len(contract.content) for contract in batch_data.contracts)
+    if total_size > settings.MAX_BATCH_TOTAL_SIZE:
+        raise HTTPException(status_code=413, detail="Batch exceeds the maximum total size")
+
+    return _stream_validation_results([(contract.name, contract.content) for contract in batch_data.contracts])
+
+@router.post("/contracts/validate/batch/files")
+async def validate_contract_files_batch(
+    files: List[UploadFile] = File(...),
+    token: str = None,
+    db: Session = Depends(get_db)
+):
+    await get_current_user(token, db)
+
+    contracts = []
+    total_size = 0
+    try:
+        for upload in files:
+            data = await upload.read(settings.MAX_BATCH_TOTAL_SIZE - total_size + 1)
+            total_size += len(data)
+            if total_size > settings.MAX_BATCH_TOTAL_SIZE:
+                raise HTTPException(status_code=413, detail="Batch exceeds the maximum total size")
+
+            if FileUtils.get_file_extension(upload.filename) == '.zip':
+                contracts.extend(validation_service.extract_contracts_from_zip(data))
+            elif FileUtils.is_valid_contract_file(upload.filename):
+                contracts.append((upload.filename, data.decode('utf-8')))
+    except (ValueError, zipfile.BadZipFile) as e:
+        # UnicodeDecodeError is a ValueError too
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return _stream_validation_results(contracts)
+
 # Deployment endpoints
 @router.post("/contracts/{submission_id}/deploy")
 async def deploy_contract(
@@ -196,12 +518,14 @@ async def deploy_contract(
         deployment_result = await flow_service.deploy_contract(
             contract_code=submission.generated_contract,
             contract_name=f"Contract_{submission_id}",
-            network=deploy_data.network
+            network=deploy_data.network,
+            user_id=current_user.id
         )
 
         # Save deployment record
         deployment = Deployment(
             submission_id=submission_id,
+            user_id=current_user.id,
             network=deploy_data.network,
             transaction_hash=deployment_result.get("transaction_hash"),
             contract_address=deployment_result.get("contract_address"),
@@ -211,14 +535,149 @@ async def deploy_contract(
         )
 
         db.add(deployment)
+        statistics_service.record_deployment(
+            db,
+            current_user.id,
+            succeeded=deployment_result["success"],
+            gas_used=deployment_result.get("gas_used") or 0
+        )
         db.commit()
         db.refresh(deployment)
 
         return deployment_result
 
+    except RateLimitExceeded as e:
+        raise _rate_limited(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Listing endpoints
+def _keyset_page(query, id_column, cursor: Optional[str], page_size: int):
+    """Fetch one newest-first page after cursor, returning (rows, next_cursor)"""
+    if cursor:
+        last_id = ResponseFormatter.decode_cursor(cursor)
+        if last_id is None:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.filter(id_column < last_id)
+
+    rows = query.order_by(id_column.desc()).limit(page_size + 1).all()
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = ResponseFormatter.encode_cursor(rows[-1].id)
+    return rows, next_cursor
+
+@router.get("/contracts")
+async def list_contract_submissions(
+    token: str,
+    cursor: Optional[str] = None,
+    page_size: int = Query(20, ge=1, le=100),
+    status: Optional[str] = None,
+    include_total: bool = False,
+    db: Session = Depends(get_db)
+):
+    current_user = await get_current_user(token, db)
+
+    # Only summary columns are selected so contract blobs are never loaded
+    query = db.query(
+        ContractSubmission.id,
+        ContractSubmission.input_type,
+        ContractSubmission.network,
+        ContractSubmission.status,
+        ContractSubmission.content_hash,
+        ContractSubmission.created_at,
+        ContractSubmission.updated_at
+    ).filter(ContractSubmission.user_id == current_user.id)
+    if status:
+        query = query.filter(ContractSubmission.status == status)
+
+    total = query.count() if include_total else None
+    rows, next_cursor = _keyset_page(query, ContractSubmission.id, cursor, page_size)
+
+    items = [
+        {
+            "id": row.id,
+            "input_type": row.input_type,
+            "network": row.network,
+            "status": row.status,
+            "content_hash": row.content_hash,
+            "created_at": row.created_at,
+            "updated_at": row.updated_at
+        }
+        for row in rows
+    ]
+    return ResponseFormatter.paginated_response(items, total, None, page_size, next_cursor)
+
+@router.delete("/contracts/{submission_id}")
+async def delete_contract_submission(submission_id: int, token: str, db: Session = Depends(get_db)):
+    """Delete a submission that was never deployed and release its stored source"""
+    current_user = await get_current_user(token, db)
+
+    submission = db.query(ContractSubmission).filter(
+        ContractSubmission.id == submission_id,
+        ContractSubmission.user_id == current_user.id
+    ).first()
+    if not submission:
+        raise HTTPException(status_code=404, detail="Contract submission not found")
+    if db.query(Deployment.id).filter(Deployment.submission_id == submission_id).first():
+        raise HTTPException(status_code=409, detail="Deployed submissions are kept for the deployment history")
+
+    # Usage rows stay for budgets and billing, just no longer linked
+    db.query(LLMUsage).filter(LLMUsage.submission_id == submission_id).update(
+        {LLMUsage.submission_id: None},
+        synchronize_session=False
+    )
+    db.query(ContractConfiguration).filter(ContractConfiguration.submission_id == submission_id).delete(
+        synchronize_session=False
+    )
+    content_hash, generated_hash = submission.content_hash, submission.generated_hash
+    db.delete(submission)
+    db.flush()
+    # Blobs shared with other submissions survive; the last reference deletes them
+    blob_service.release(db, content_hash)
+    blob_service.release(db, generated_hash)
+    statistics_service.record_submission(db, current_user.id, count=-1)
+    db.commit()
+
+    return {"message": "Contract submission deleted", "submission_id": submission_id}
+
+@router.get("/deployments")
+async def list_deployments(
+    token: str,
+    cursor: Optional[str] = None,
+    page_size: int = Query(20, ge=1, le=100),
+    status: Optional[str] = None,
+    submission_id: Optional[int] = None,
+    include_total: bool = False,
+    db: Session = Depends(get_db)
+):
+    current_user = await get_current_user(token, db)
+
+    query = db.query(Deployment).filter(Deployment.user_id == current_user.id)
+    if status:
+        query = query.filter(Deployment.status == status)
+    if submission_id is not None:
+        query = query.filter(Deployment.submission_id == submission_id)
+
+    total = query.count() if include_total else None
+    rows, next_cursor = _keyset_page(query, Deployment.id, cursor, page_size)
+
+    items = [
+        {
+            "id": deployment.id,
+            "submission_id": deployment.submission_id,
+            "network": deployment.network,
+            "transaction_hash": deployment.transaction_hash,
+            "contract_address": deployment.contract_address,
+            "status": deployment.status,
+            "gas_used": deployment.gas_used,
+            "error_message": deployment.error_message,
+            "created_at": deployment.created_at
+        }
+        for deployment in rows
+    ]
+    return ResponseFormatter.paginated_response(items, total, None, page_size, next_cursor)
+
 @router.get("/contracts/{submission_id}/deployments/{deployment_id}")
 async def get_deployment_status(
     submission_id: int,
@@ -271,27 +730,26 @@ async def get_learning_insights(token: str, db: Session = Depends(get_db)):
     insights = learning_service.get_user_insights(db, current_user.id)
     return insights
 
-@router.get("/statistics")
-async def get_system_statistics(token: str, db: Session = Depends(get_db)):
+@router.get("/analytics/timeseries")
+async def get_analytics_timeseries(
+    token: str,
+    granularity: str = "hour",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    db: Session = Depends(get_db)
+):
     current_user = await get_current_user(token, db)
+    try:
+        points = analytics_service.get_timeseries(db, current_user.id, granularity, start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"granularity": granularity, "points": points}
 
-    # Get various statistics
-    total_submissions = db.query(ContractSubmission).filter(
-        ContractSubmission.user_id == current_user.id
-    ).count()
-
-    total_deployments = db.query(Deployment).join(ContractSubmission).filter(
-        ContractSubmission.user_id == current_user.id
-    ).count()
-
-    successful_deployments = db.query(Deployment).join(ContractSubmission).filter(
-        ContractSubmission.user_id == current_user.id,
-        Deployment.status == "DEPLOYED"
-    ).count()
+@router.get("/llm/providers")
+async def get_llm_provider_stats():
+    return llm_service.get_provider_stats()
 
-    return {
-        "total_submissions": total_submissions,
-        "total_deployments": total_deployments,
-        "successful_deployments": successful_deployments,
-        "success_rate": successful_deployments / total_deployments if total_deployments > 0 else 0
-    }
\ No newline at end of file
+@router.get("/statistics")
+async def get_system_statistics(token: str, db: Session = Depends(get_db)):
+    current_user = await get_current_user(token, db)
+    return statistics_service.get_user_statistics(db, current_user.id)
\ No newline at end of file
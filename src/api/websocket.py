@@ -1,91 +1,391 @@
-from fastapi import WebSocket, WebSocketDisconnect
-from typing import Dict, List
+from fastapi import WebSocket, WebSocketDisconnect, status
+from typing import Any, Dict, List, Optional, Set, Union
 import json
 import asyncio
 from src.config import settings
+from src.api.pubsub import PubSubBackend, create_pubsub_backend
+from src.api.encoding import (
+    SUPPORTED_ENCODINGS, EncodedMessage, TokenDeltaDecoder, TokenDeltaEncoder,
+    as_encoded, build_envelope, split_envelope
+)
+from src.models.database import SessionLocal
+from src.models.contract import ContractSubmission, Deployment
+from src.services.user_service import UserService
+
+user_service = UserService()
+token_deltas = TokenDeltaEncoder()
+
+# Topics clients can subscribe to, e.g. "submission:42" or "doc_ingest:7.job_1a2b"
+TOPIC_KINDS = ("submission", "deployment", "doc_ingest")
+
+def topic_name(kind: str, resource_id) -> str:
+    """Build the topic name for a resource"""
+    return f"{kind}:{resource_id}"
+
+def doc_ingest_topic(user_id: int, job_id: str) -> str:
+    """Topic for a documentation ingest job; the owner's id is part of the name"""
+    return topic_name("doc_ingest", f"{user_id}.{job_id}")
 
 class ConnectionManager:
-    def __init__(self):
+    def __init__(self, backend: Optional[PubSubBackend] = None):
         self.active_connections: Dict[int, List[WebSocket]] = {}
+        self.connection_users: Dict[WebSocket, int] = {}
+        self.topic_subscribers: Dict[str, Set[WebSocket]] = {}
+        self.connection_topics: Dict[WebSocket, Set[str]] = {}
+        self.connection_encodings: Dict[WebSocket, str] = {}
+        # Delta-encoded streams each socket has received a frame of
+        self.connection_streams: Dict[WebSocket, Set[str]] = {}
+        self.stream_texts = TokenDeltaDecoder()
+        self.backend = backend or create_pubsub_backend(settings.PUBSUB_URL)
+        self.channel = settings.PUBSUB_CHANNEL
+
+    async def start(self):
+        """Start receiving events published by any worker"""
+        await self.backend.start(self.channel, self._deliver)
+
+    async def stop(self):
+        await self.backend.stop()
+
+    async def publish(
+        self,
+        message: Union[str, Dict[str, Any], EncodedMessage],
+        user_id: Optional[int] = None,
+        topics: Optional[List[str]] = None,
+        stream: Optional[str] = None,
+        stream_done: bool = False
+    ):
+        """Publish a message on whichever worker holds the socket
+
+        It goes to every socket of user_id and every socket subscribed to at
+        least one of topics, each socket receiving it once; with neither, it
+        goes to everyone. The event is serialized once here and forwarded
+        verbatim to JSON sockets.
+
+        stream names the delta-encoded token stream the message belongs to, so
+        a socket's first frame of it can be replaced with a full snapshot.
+        """
+        header = {"user_id": user_id, "topics": topics or []}
+        if stream is not None:
+            header.update(stream=stream, stream_done=stream_done)
+        await self.backend.publish(self.channel, build_envelope(header, as_encoded(message)))
 
-    async def connect(self, websocket: WebSocket, user_id: int):
+    async def _deliver(self, channel: str, envelope: str):
+        header, event_text = split_envelope(envelope)
+        message = EncodedMessage(text=event_text)
+        topics = header.get("topics") or []
+        stream = header.get("stream")
+        if stream is not None:
+            await self.send_message(
+                message, header["user_id"], topics,
+                stream=stream,
+                snapshot=self._stream_snapshot(stream, message, header["stream_done"]),
+                stream_done=header["stream_done"]
+            )
+        elif topics or header["user_id"] is not None:
+            await self.send_message(message, header["user_id"], topics)
+        else:
+            await self.broadcast(message)
+
+    def _stream_snapshot(self, stream: str, message: EncodedMessage, done: bool) -> Optional[EncodedMessage]:
+        """The frame to send instead of message to sockets new to the stream, if it differs"""
+        data = message.event["data"]
+        text = self.stream_texts.apply(stream, data["offset"], data["delta"])
+        if done:
+            self.stream_texts.finish(stream)
+        if data["offset"] == 0 or text is None:
+            return None
+        return EncodedMessage({**message.event, "data": {**data, "offset": 0, "delta": text, "snapshot": True}})
+
+    async def connect(self, websocket: WebSocket, user_id: int, encoding: str = "json"):
         await websocket.accept()
         if user_id not in self.active_connections:
             self.active_connections[user_id] = []
         self.active_connections[user_id].append(websocket)
+        self.connection_users[websocket] = user_id
+        self.set_encoding(websocket, encoding)
+
+    def set_encoding(self, websocket: WebSocket, encoding: str) -> bool:
+        """Select the frame encoding for a connection, json unless negotiated otherwise"""
+        if encoding not in SUPPORTED_ENCODINGS:
+            return False
+        if encoding == "json":
+            self.connection_encodings.pop(websocket, None)
+        else:
+            self.connection_encodings[websocket] = encoding
+        return True
+
+    async def send_to(self, websocket: WebSocket, message: Union[str, Dict[str, Any], EncodedMessage]):
+        """Send a message to one socket in its negotiated encoding"""
+        encoding = self.connection_encodings.get(websocket, "json")
+        frame = as_encoded(message).frame(encoding)
+        if encoding == "json":
+            await websocket.send_text(frame)
+        else:
+            await websocket.send_bytes(frame)
 
     def disconnect(self, websocket: WebSocket, user_id: int):
-        if user_id in self.active_connections:
+        if user_id in self.active_connections and websocket in self.active_connections[user_id]:
             self.active_connections[user_id].remove(websocket)
             if not self.active_connections[user_id]:
                 del self.active_connections[user_id]
+        self.connection_users.pop(websocket, None)
+        self.connection_streams.pop(websocket, None)
+        for topic in self.connection_topics.pop(websocket, set()):
+            self._remove_subscriber(topic, websocket)
+        self.connection_encodings.pop(websocket, None)
 
-    async def send_personal_message(self, message: str, user_id: int):
+    def subscribe(self, websocket: WebSocket, topic: str):
+        self.topic_subscribers.setdefault(topic, set()).add(websocket)
+        self.connection_topics.setdefault(websocket, set()).add(topic)
+
+    def unsubscribe(self, websocket: WebSocket, topic: str):
+        self._remove_subscriber(topic, websocket)
+        topics = self.connection_topics.get(websocket)
+        if topics is not None:
+            topics.discard(topic)
+            if not topics:
+                del self.connection_topics[websocket]
+
+    def _remove_subscriber(self, topic: str, websocket: WebSocket):
+        subscribers = self.topic_subscribers.get(topic)
+        if subscribers is not None:
+            subscribers.discard(websocket)
+            if not subscribers:
+                del self.topic_subscribers[topic]
+
+    async def send_personal_message(self, message: Union[str, EncodedMessage], user_id: int):
         if user_id in self.active_connections:
-            for connection in self.active_connections[user_id]:
+            message = as_encoded(message)
+            for connection in list(self.active_connections[user_id]):
                 try:
-                    await connection.send_text(message)
+                    await self.send_to(connection, message)
                 except:
                     # Connection might be closed, remove it
-                    self.active_connections[user_id].remove(connection)
+                    self.disconnect(connection, user_id)
+
+    async def send_topic_message(self, message: Union[str, EncodedMessage], topics: List[str]):
+        """Send message once to every socket subscribed to any of the topics"""
+        await self.send_message(message, None, topics)
 
-    async def broadcast(self, message: str):
+    async def send_message(
+        self,
+        message: Union[str, EncodedMessage],
+        user_id: Optional[int],
+        topics: List[str],
+        stream: Optional[str] = None,
+        snapshot: Optional[EncodedMessage] = None,
+        stream_done: bool = False
+    ):
+        """Send message once to every socket of user_id and every subscriber of the topics
+
+        For a token stream, sockets that have not had a frame of it yet get
+        snapshot instead, when there is one.
+        """
+        recipients = set(self.active_connections.get(user_id, ())) if user_id is not None else set()
+        for topic in topics:
+            recipients.update(self.topic_subscribers.get(topic, ()))
+
+        message = as_encoded(message)
+        for connection in recipients:
+            outgoing = message
+            if stream is not None:
+                streams = self.connection_streams.setdefault(connection, set())
+                if stream not in streams and snapshot is not None:
+                    outgoing = snapshot
+                if stream_done:
+                    streams.discard(stream)
+                    if not streams:
+                        del self.connection_streams[connection]
+                else:
+                    streams.add(stream)
+            try:
+                await self.send_to(connection, outgoing)
+            except:
+                # Connection might be closed, remove it
+                self.disconnect(connection, self.connection_users.get(connection))
+
+    async def broadcast(self, message: Union[str, EncodedMessage]):
+        message = as_encoded(message)
         for user_connections in self.active_connections.values():
             for connection in user_connections:
                 try:
-                    await connection.send_text(message)
+                    await self.send_to(connection, message)
                 except:
                     # Connection might be closed
                     pass
 
 manager = ConnectionManager()
 
-async def websocket_endpoint(websocket: WebSocket, token: str = None):
-    # In a real implementation, you would validate the JWT token here
-    # For now, we'll use a simple user_id from the token
-    user_id = 1  # Default user for demo purposes
+def authenticate_websocket(token: Optional[str]) -> Optional[int]:
+    """Resolve the user id for a WebSocket access token"""
+    if not token:
+        return None
+
+    payload = user_service.verify_token(token)
+    try:
+        # A validly signed token can still carry a missing or non-numeric sub
+        user_id = int(payload["sub"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    db = SessionLocal()
+    try:
+        user = user_service.get_user_by_id(db, user_id)
+        if user is None or not user.is_active:
+            return None
+        return user.id
+    finally:
+        db.close()
+
+def can_subscribe(user_id: int, topic: str) -> bool:
+    """Check that topic is well formed and the user may receive its events"""
+    kind, _, resource_id = topic.partition(":")
+    if kind not in TOPIC_KINDS or not resource_id:
+        return False
+
+    if kind == "doc_ingest":
+        owner, _, job_id = resource_id.partition(".")
+        return bool(job_id) and owner == str(user_id)
 
-    await manager.connect(websocket, user_id)
+    if not resource_id.isdigit():
+        return False
+
+    db = SessionLocal()
+    try:
+        if kind == "submission":
+            query = db.query(ContractSubmission.id).filter(
+                ContractSubmission.id == int(resource_id),
+                ContractSubmission.user_id == user_id
+            )
+        else:
+            query = db.query(Deployment.id).join(ContractSubmission).filter(
+                Deployment.id == int(resource_id),
+                ContractSubmission.user_id == user_id
+            )
+        return query.first() is not None
+    finally:
+        db.close()
+
+async def websocket_endpoint(websocket: WebSocket, token: str = None, encoding: str = "json"):
+    user_id = authenticate_websocket(token or websocket.query_params.get("token"))
+    if user_id is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    if encoding not in SUPPORTED_ENCODINGS:
+        encoding = "json"
+    await manager.connect(websocket, user_id, encoding)
     try:
         while True:
             # Keep connection alive and listen for messages
             data = await websocket.receive_text()
-            message_data = json.loads(data)
+            try:
+                message_data = json.loads(data)
+            except json.JSONDecodeError:
+                await manager.send_to(websocket, {"type": "error", "message": "Invalid JSON"})
+                continue
+
+            if not isinstance(message_data, dict):
+                await manager.send_to(websocket, {"type": "error", "message": "Expected a JSON object"})
+                continue
 
             # Handle different message types
-            if message_data.get("type") == "ping":
-                await websocket.send_text(json.dumps({"type": "pong"}))
-            elif message_data.get("type") == "subscribe_updates":
-                # Handle subscription to specific updates
-                await manager.send_personal_message(
-                    json.dumps({"type": "subscription_confirmed", "subscription_id": message_data.get("subscription_id")}),
-                    user_id
-                )
+            message_type = message_data.get("type")
+            if message_type == "ping":
+                await manager.send_to(websocket, {"type": "pong"})
+            elif message_type == "set_encoding":
+                requested = message_data.get("encoding")
+                accepted = manager.set_encoding(websocket, requested)
+                await manager.send_to(websocket, {
+                    "type": "encoding_confirmed" if accepted else "error",
+                    "encoding": manager.connection_encodings.get(websocket, "json"),
+                    "supported": list(SUPPORTED_ENCODINGS)
+                })
+            elif message_type in ("subscribe", "subscribe_updates"):
+                topics = message_data.get("topics") or [message_data.get("topic")]
+                if not isinstance(topics, list):
+                    topics = [topics]
+                accepted = []
+                rejected = []
+                for topic in topics:
+                    if isinstance(topic, str) and can_subscribe(user_id, topic):
+                        manager.subscribe(websocket, topic)
+                        accepted.append(topic)
+                    else:
+                        rejected.append(topic)
+                await manager.send_to(websocket, {
+                    "type": "subscription_confirmed",
+                    "subscription_id": message_data.get("subscription_id"),
+                    "topics": accepted,
+                    "rejected": rejected
+                })
+            elif message_type == "unsubscribe":
+                topics = message_data.get("topics") or [message_data.get("topic")]
+                if not isinstance(topics, list):
+                    topics = [topics]
+                for topic in topics:
+                    if isinstance(topic, str):
+                        manager.unsubscribe(websocket, topic)
+                await manager.send_to(websocket, {"type": "unsubscribed", "topics": topics})
 
     except WebSocketDisconnect:
+        pass
+    finally:
+        # Any error, not only a disconnect, must leave no socket or subscription behind
         manager.disconnect(websocket, user_id)
 
 # Helper functions to send updates via WebSocket
 async def send_deployment_update(user_id: int, deployment_data: dict):
-    """Send deployment status update to user"""
-    message = json.dumps({
+    """Send deployment status update to the user and subscribers of the deployment or its submission"""
+    message = EncodedMessage({
         "type": "deployment_update",
         "data": deployment_data
     })
-    await manager.send_personal_message(message, user_id)
+    topics = []
+    if deployment_data.get("deployment_id") is not None:
+        topics.append(topic_name("deployment", deployment_data["deployment_id"]))
+    if deployment_data.get("submission_id") is not None:
+        topics.append(topic_name("submission", deployment_data["submission_id"]))
+    await manager.publish(message, user_id, topics)
 
 async def send_generation_progress(user_id: int, progress_data: dict):
-    """Send contract generation progress update to user"""
-    message = json.dumps({
+    """Send contract generation progress update to the user and subscribers of the submission
+
+    A cumulative "content" field is delta-encoded per submission, so each frame
+    only carries the tokens generated since the previous one; a socket's first
+    frame of the stream carries everything so far.
+    """
+    topics = []
+    data = progress_data
+    stream_id = None
+    submission_id = progress_data.get("submission_id")
+    if submission_id is not None:
+        topics.append(topic_name("submission", submission_id))
+        if isinstance(progress_data.get("content"), str):
+            stream_id = str(submission_id)
+            data = {key: value for key, value in progress_data.items() if key != "content"}
+            data.update(token_deltas.encode(stream_id, progress_data["content"]))
+            if progress_data.get("done"):
+                token_deltas.finish(stream_id)
+
+    message = EncodedMessage({
         "type": "generation_progress",
-        "data": progress_data
+        "data": data
+    })
+    await manager.publish(message, user_id, topics, stream=stream_id, stream_done=bool(progress_data.get("done")))
+
+async def send_doc_ingest_progress(user_id: int, job_id: str, progress_data: dict):
+    """Send documentation ingest progress to the job's owner and its subscribers"""
+    message = EncodedMessage({
+        "type": "doc_ingest_progress",
+        "data": {"job_id": job_id, **progress_data}
     })
-    await manager.send_personal_message(message, user_id)
+    await manager.publish(message, user_id, [doc_ingest_topic(user_id, job_id)])
 
 async def send_system_notification(user_id: int, notification: dict):
     """Send system notification to user"""
-    message = json.dumps({
+    message = EncodedMessage({
         "type": "notification",
         "data": notification
     })
-    await manager.send_personal_message(message, user_id)
\ No newline at end of file
+    await manager.publish(message, user_id)
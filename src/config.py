@@ -2,6 +2,8 @@ from pydantic_settings import BaseSettings
 from typing import List
 import os
 
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 class Settings(BaseSettings):
     # Application
     APP_NAME: str = "Smart Contract LLM Builder"
@@ -16,6 +18,36 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str = ""
     GROQ_API_KEY: str = ""
     DEFAULT_LLM_PROVIDER: str = "OPENAI"
+    # Provider routing: rolling stats window, circuit breaking and hedging
+    LLM_STATS_WINDOW: int = 100
+    LLM_FAILURE_THRESHOLD: int = 3
+    LLM_PROVIDER_COOLDOWN_SECONDS: float = 30.0
+    LLM_HEDGE_ENABLED: bool = False
+    LLM_HEDGE_MIN_DELAY_SECONDS: float = 2.0
+    # Concurrent identical generation requests share one provider call
+    LLM_COALESCE_ENABLED: bool = True
+    # Extra LLM round trips allowed to fix a generated contract that fails validation
+    CONTRACT_REPAIR_ATTEMPTS: int = 2
+    # Offline mock provider for load tests; replaces the real providers when enabled
+    LLM_MOCK_ENABLED: bool = False
+    LLM_MOCK_TOKENS_PER_SECOND: float = 200.0
+    LLM_MOCK_LATENCY_MEDIAN_SECONDS: float = 0.5
+    LLM_MOCK_LATENCY_SIGMA: float = 0.5
+    LLM_MOCK_ERROR_RATE: float = 0.0
+
+    # Retrieval-augmented generation from the documentation corpus
+    RAG_ENABLED: bool = True
+    RAG_TOP_K: int = 4
+    RAG_TOKEN_BUDGET: int = 1500
+    RAG_MIN_SCORE: float = 0.1
+    RAG_CHUNK_CHARS: int = 1200
+    RAG_CACHE_TTL_SECONDS: int = 300
+
+    # Per-user quotas
+    LLM_GENERATIONS_PER_USER_PER_HOUR: int = 30
+    DEPLOYS_PER_USER_PER_DAY: int = 20
+    LLM_DAILY_TOKEN_BUDGET_PER_USER: int = 500000
+    LLM_DAILY_COST_BUDGET_USD: float = 10.0
 
     # Flow Blockchain
     FLOW_NETWORK: str = "testnet"
@@ -26,6 +58,59 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str = "your-secret-key-change-this-in-production"
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRATION_HOURS: int = 24
+    # Secrets for encrypting stored data, newest first; older ones only decrypt.
+    # Defaults to JWT_SECRET_KEY when empty.
+    ENCRYPTION_SECRETS: List[str] = []
+
+    # WebSocket pub/sub ("memory://" for a single worker, redis:// or unix:// to share events across workers)
+    PUBSUB_URL: str = "memory://"
+    PUBSUB_CHANNEL: str = "smart_contract_llm:ws"
+    # Streamed token state kept per generation; abandoned streams expire after the TTL
+    WS_STREAM_TTL_SECONDS: int = 600
+    WS_MAX_STREAMS: int = 10000
+
+    # Contract uploads
+    MAX_UPLOAD_SIZE: int = 1024 * 1024
+    UPLOAD_CHUNK_SIZE: int = 64 * 1024
+
+    # Batch validation (0 workers = one per CPU core)
+    VALIDATION_WORKERS: int = 0
+    MAX_BATCH_CONTRACTS: int = 1000
+    MAX_BATCH_TOTAL_SIZE: int = 50 * 1024 * 1024
+
+    # LangChain chat endpoints, mounted at /api/langchain
+    CHAT_ENABLED: bool = True
+    CHAT_MODEL: str = "gpt-4"
+    CHAT_TEMPERATURE: float = 0.7
+    CHAT_REQUESTS_PER_MINUTE: int = 20
+    # LangChain chat history
+    CHAT_HISTORY_TOKEN_BUDGET: int = 3000
+    CHAT_SUMMARY_CACHE_TTL_SECONDS: int = 24 * 3600
+
+    # Batch generation
+    MAX_BATCH_GENERATIONS: int = 50
+    GENERATION_BATCH_CONCURRENCY: int = 4
+
+    # Dashboard statistics
+    STATISTICS_CACHE_TTL_SECONDS: int = 30
+
+    # Analytics rollups
+    ROLLUP_INTERVAL_SECONDS: int = 60
+    ROLLUP_BATCH_SIZE: int = 5000
+    # Rows younger than this are left for the next run so slow transactions can commit
+    ROLLUP_LAG_SECONDS: int = 5
+
+    # Local state files such as the audit log
+    DATA_DIR: str = os.path.join(PROJECT_ROOT, "data")
+
+    # Audit log, relative to DATA_DIR (empty AUDIT_DB_PATH keeps events in memory only)
+    AUDIT_DB_PATH: str = "audit_log.db"
+    AUDIT_BUFFER_SIZE: int = 1000
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    # Events waiting while SQLite is unavailable; the oldest are dropped beyond this
+    AUDIT_MAX_PENDING: int = 100000
+    AUDIT_MAX_RETRY_SECONDS: float = 60.0
 
     # CORS
     ALLOWED_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:8000"]
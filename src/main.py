@@ -2,8 +2,9 @@ from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from src.config import settings
-from src.api.routes import router
-from src.api.websocket import websocket_endpoint
+from src.api.routes import router, llm_service, validation_service, analytics_service
+from src.api.websocket import websocket_endpoint, manager
+import asyncio
 import uvicorn
 
 app = FastAPI(
@@ -25,7 +26,26 @@ app.add_middleware(
 app.include_router(router, prefix="/api/v1")
 
 # WebSocket endpoint
-app.add_websocket_route("/ws", websocket_endpoint)
+app.add_api_websocket_route("/ws", websocket_endpoint)
+
+# LangChain chat (token-authenticated), sharing the API's LLM clients, quotas and usage budget
+if settings.CHAT_ENABLED:
+    from src.api.chat import create_chat_app
+    app.mount("/api/langchain", create_chat_app(llm_service))
+
+background_tasks = []
+
+@app.on_event("startup")
+async def start_background_services():
+    await manager.start()
+    background_tasks.append(asyncio.create_task(analytics_service.run_periodically()))
+
+@app.on_event("shutdown")
+async def stop_background_services():
+    for task in background_tasks:
+        task.cancel()
+    await manager.stop()
+    validation_service.shutdown()
 
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
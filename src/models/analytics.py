@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from sqlalchemy.sql import func
+from src.models.database import Base
+
+class AnalyticsRollup(Base):
+    """Partial aggregates for one time bucket, appended by each rollup run
+
+    A bucket can have several rows (one per run that saw events in it);
+    queries sum them.
+    """
+    __tablename__ = "analytics_rollups"
+    __table_args__ = (
+        Index("ix_analytics_rollups_granularity_user_id_bucket", "granularity", "user_id", "bucket_start"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    granularity = Column(String(8), nullable=False)
+    bucket_start = Column(DateTime, nullable=False)
+    user_id = Column(Integer, nullable=False)
+    deployments = Column(Integer, nullable=False, default=0)
+    successful_deployments = Column(Integer, nullable=False, default=0)
+    gas_used = Column(Integer, nullable=False, default=0)
+    generations = Column(Integer, nullable=False, default=0)
+    generation_ms_total = Column(Integer, nullable=False, default=0)
+    generation_ms_max = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class AnalyticsWatermark(Base):
+    """Highest raw row id already folded into the rollups, per source table"""
+    __tablename__ = "analytics_watermarks"
+
+    source = Column(String, primary_key=True)
+    last_id = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
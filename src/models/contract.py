@@ -1,31 +1,85 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Boolean, ForeignKey, LargeBinary, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
+from typing import Optional
 from src.models.database import Base
+from src.utils.helpers import CompressionUtils
+
+class ContractBlob(Base):
+    """Compressed contract source stored once per SHA-256 of its UTF-8 bytes"""
+    __tablename__ = "contract_blobs"
+
+    hash = Column(String(64), primary_key=True)
+    compression = Column(String(8), nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    size = Column(Integer, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    @property
+    def text(self) -> str:
+        # Decompressed once per loaded instance
+        cached = self.__dict__.get("_text")
+        if cached is None:
+            cached = CompressionUtils.decompress(self.compression, self.data).decode("utf-8")
+            self.__dict__["_text"] = cached
+        return cached
 
 class ContractSubmission(Base):
     __tablename__ = "contract_submissions"
+    __table_args__ = (
+        # Keyset pagination walks these newest-first by id
+        Index("ix_contract_submissions_user_id_id", "user_id", "id"),
+        Index("ix_contract_submissions_user_id_status_id", "user_id", "status", "id"),
+        Index("ix_contract_submissions_created_at", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     input_type = Column(String, nullable=False)
-    content = Column(Text, nullable=False)
-    generated_contract = Column(Text)
+    content_hash = Column(String(64), ForeignKey("contract_blobs.hash"), index=True)
+    generated_hash = Column(String(64), ForeignKey("contract_blobs.hash"))
+    # Inline source from before blob storage; new rows leave these empty
+    legacy_content = Column("content", Text)
+    legacy_generated_contract = Column("generated_contract", Text)
     pre_conditions = Column(JSON)
     post_conditions = Column(JSON)
     network = Column(String, nullable=False)
     status = Column(String, default="PENDING")
+    generation_ms = Column(Integer)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     user = relationship("User", backref="contract_submissions")
     deployments = relationship("Deployment", backref="submission")
+    content_blob = relationship("ContractBlob", foreign_keys=[content_hash])
+    generated_blob = relationship("ContractBlob", foreign_keys=[generated_hash])
+
+    @property
+    def content(self) -> Optional[str]:
+        if self.content_blob is not None:
+            return self.content_blob.text
+        return self.legacy_content
+
+    @property
+    def generated_contract(self) -> Optional[str]:
+        if self.generated_blob is not None:
+            return self.generated_blob.text
+        return self.legacy_generated_contract
 
 class Deployment(Base):
     __tablename__ = "deployments"
+    __table_args__ = (
+        Index("ix_deployments_user_id_id", "user_id", "id"),
+        Index("ix_deployments_user_id_status_id", "user_id", "status", "id"),
+        Index("ix_deployments_submission_id_id", "submission_id", "id"),
+        Index("ix_deployments_created_at", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     submission_id = Column(Integer, ForeignKey("contract_submissions.id"), nullable=False)
+    # Copied from the submission so a user's deployments can be listed without a join
+    user_id = Column(Integer, ForeignKey("users.id"))
     network = Column(String, nullable=False)
     transaction_hash = Column(String)
     contract_address = Column(String)
@@ -36,6 +90,17 @@ class Deployment(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+class UserStatistics(Base):
+    """Per-user counters, updated in the same transaction as the rows they count"""
+    __tablename__ = "user_statistics"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    total_submissions = Column(Integer, nullable=False, default=0)
+    total_deployments = Column(Integer, nullable=False, default=0)
+    successful_deployments = Column(Integer, nullable=False, default=0)
+    total_gas_used = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
 class ContractConfiguration(Base):
     __tablename__ = "contract_configurations"
 
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Index
+from sqlalchemy.sql import func
+from src.models.database import Base
+
+class LLMUsage(Base):
+    """Token usage and cost of one provider call"""
+    __tablename__ = "llm_usage"
+    __table_args__ = (
+        Index("ix_llm_usage_user_id_created_at", "user_id", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    submission_id = Column(Integer, ForeignKey("contract_submissions.id"), nullable=True)
+    provider = Column(String(16), nullable=False)
+    model = Column(String(64), nullable=False)
+    prompt_tokens = Column(Integer, nullable=False, default=0)
+    completion_tokens = Column(Integer, nullable=False, default=0)
+    # Millionths of a US dollar, so sums stay exact
+    cost_microusd = Column(Integer, nullable=False, default=0)
+    # True when the counts come from a local estimate rather than the provider
+    estimated = Column(Boolean, nullable=False, default=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
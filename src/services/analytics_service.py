@@ -0,0 +1,207 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from src.config import settings
+from src.models.analytics import AnalyticsRollup, AnalyticsWatermark
+from src.models.contract import ContractSubmission, Deployment
+from src.models.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+GRANULARITIES = ("minute", "hour", "day")
+
+METRIC_FIELDS = (
+    "deployments", "successful_deployments", "gas_used",
+    "generations", "generation_ms_total", "generation_ms_max"
+)
+
+def bucket_start(moment: datetime, granularity: str) -> datetime:
+    """Truncate a naive UTC datetime to the start of its bucket"""
+    if granularity == "minute":
+        return moment.replace(second=0, microsecond=0)
+    if granularity == "hour":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(f"Unsupported granularity: {granularity}")
+
+def as_naive_utc(moment: datetime) -> datetime:
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+class AnalyticsService:
+    """Folds new deployments and generations into minute/hour/day rollups
+
+    Each run reads raw rows past a per-source id watermark, appends one
+    partial-aggregate row per touched bucket and advances the watermark in the
+    same transaction, so history is never rescanned.
+    """
+
+    def __init__(self):
+        self.batch_size = settings.ROLLUP_BATCH_SIZE
+        self.lag = timedelta(seconds=settings.ROLLUP_LAG_SECONDS)
+
+    def run_once(self, db: Session) -> int:
+        """Roll up one batch per source; returns the number of raw rows folded in"""
+        cutoff = datetime.utcnow() - self.lag
+        buckets: Dict[tuple, Dict[str, int]] = {}
+        watermarks = {}
+
+        deployments = self._pending_rows(
+            db, "deployments", Deployment,
+            [Deployment.id, Deployment.user_id, Deployment.created_at, Deployment.status, Deployment.gas_used],
+            cutoff, watermarks
+        )
+        for row in deployments:
+            for metrics in self._touch(buckets, row.user_id, row.created_at):
+                metrics["deployments"] += 1
+                if row.status == "DEPLOYED":
+                    metrics["successful_deployments"] += 1
+                metrics["gas_used"] += row.gas_used or 0
+
+        submissions = self._pending_rows(
+            db, "generations", ContractSubmission,
+            [ContractSubmission.id, ContractSubmission.user_id, ContractSubmission.created_at, ContractSubmission.generation_ms],
+            cutoff, watermarks
+        )
+        for row in submissions:
+            if row.generation_ms is None:
+                continue
+            for metrics in self._touch(buckets, row.user_id, row.created_at):
+                metrics["generations"] += 1
+                metrics["generation_ms_total"] += row.generation_ms
+                metrics["generation_ms_max"] = max(metrics["generation_ms_max"], row.generation_ms)
+
+        processed = len(deployments) + len(submissions)
+        if not processed:
+            return 0
+
+        db.add_all(
+            AnalyticsRollup(granularity=granularity, bucket_start=start, user_id=user_id, **metrics)
+            for (granularity, start, user_id), metrics in buckets.items()
+        )
+
+        try:
+            for source, (previous, latest) in watermarks.items():
+                if latest > previous and not self._advance_watermark(db, source, previous, latest):
+                    # Another worker rolled up the same rows first
+                    db.rollback()
+                    return 0
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            return 0
+
+        return processed
+
+    def _pending_rows(self, db: Session, source: str, model, columns: list, cutoff: datetime, watermarks: dict) -> list:
+        watermark = db.get(AnalyticsWatermark, source)
+        previous = watermark.last_id if watermark is not None else 0
+
+        rows = db.query(*columns).filter(model.id > previous).order_by(model.id).limit(self.batch_size).all()
+
+        # Stop at the first row that is too recent, so the watermark never
+        # skips past rows that may still be joined by older transactions
+        ready = []
+        for row in rows:
+            if row.created_at is None or as_naive_utc(row.created_at) > cutoff:
+                break
+            ready.append(row)
+
+        watermarks[source] = (previous, ready[-1].id if ready else previous)
+        return ready
+
+    @staticmethod
+    def _touch(buckets: dict, user_id: Optional[int], created_at: datetime):
+        moment = as_naive_utc(created_at)
+        for granularity in GRANULARITIES:
+            key = (granularity, bucket_start(moment, granularity), user_id or 0)
+            metrics = buckets.get(key)
+            if metrics is None:
+                metrics = buckets[key] = dict.fromkeys(METRIC_FIELDS, 0)
+            yield metrics
+
+    @staticmethod
+    def _advance_watermark(db: Session, source: str, previous: int, latest: int) -> bool:
+        if previous == 0 and db.get(AnalyticsWatermark, source) is None:
+            db.add(AnalyticsWatermark(source=source, last_id=latest))
+            db.flush()
+            return True
+
+        updated = db.query(AnalyticsWatermark).filter(
+            AnalyticsWatermark.source == source,
+            AnalyticsWatermark.last_id == previous
+        ).update({AnalyticsWatermark.last_id: latest}, synchronize_session=False)
+        return updated == 1
+
+    def run_pending(self) -> int:
+        """Run batches until caught up, using a fresh session"""
+        total = 0
+        db = SessionLocal()
+        try:
+            while True:
+                processed = self.run_once(db)
+                total += processed
+                if processed < self.batch_size:
+                    return total
+        finally:
+            db.close()
+
+    async def run_periodically(self):
+        while True:
+            try:
+                await asyncio.to_thread(self.run_pending)
+            except Exception as e:
+                logger.error(f"Analytics rollup failed: {str(e)}")
+            await asyncio.sleep(settings.ROLLUP_INTERVAL_SECONDS)
+
+    def get_timeseries(
+        self,
+        db: Session,
+        user_id: int,
+        granularity: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """Read a user's series from the rollups, one point per bucket"""
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"granularity must be one of {', '.join(GRANULARITIES)}")
+
+        query = db.query(
+            AnalyticsRollup.bucket_start,
+            func.sum(AnalyticsRollup.deployments),
+            func.sum(AnalyticsRollup.successful_deployments),
+            func.sum(AnalyticsRollup.gas_used),
+            func.sum(AnalyticsRollup.generations),
+            func.sum(AnalyticsRollup.generation_ms_total),
+            func.max(AnalyticsRollup.generation_ms_max)
+        ).filter(
+            AnalyticsRollup.granularity == granularity,
+            AnalyticsRollup.user_id == user_id
+        )
+        if start is not None:
+            query = query.filter(AnalyticsRollup.bucket_start >= bucket_start(as_naive_utc(start), granularity))
+        if end is not None:
+            query = query.filter(AnalyticsRollup.bucket_start < as_naive_utc(end))
+
+        points = []
+        for bucket, deployments, successful, gas_used, generations, generation_ms, generation_max in (
+            query.group_by(AnalyticsRollup.bucket_start).order_by(AnalyticsRollup.bucket_start).all()
+        ):
+            points.append({
+                "bucket_start": bucket.isoformat(),
+                "deployments": deployments,
+                "successful_deployments": successful,
+                "success_rate": successful / deployments if deployments else None,
+                "gas_used": gas_used,
+                "average_gas_used": gas_used / deployments if deployments else None,
+                "generations": generations,
+                "average_generation_ms": generation_ms / generations if generations else None,
+                "max_generation_ms": generation_max if generations else None
+            })
+        return points
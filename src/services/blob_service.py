@@ -0,0 +1,63 @@
+import hashlib
+from typing import Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from src.models.contract import ContractBlob
+from src.utils.helpers import CompressionUtils
+
+class BlobService:
+    """Content-addressed, reference-counted storage for contract source
+
+    Nothing here commits; blobs are written in the caller's transaction
+    together with the rows that reference them.
+    """
+
+    @staticmethod
+    def hash_text(text: str) -> str:
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def put(self, db: Session, text: str, references: int = 1) -> str:
+        """Store text (once) and add references to it; returns its hash"""
+        data = text.encode('utf-8')
+        key = hashlib.sha256(data).hexdigest()
+
+        if self._add_references(db, key, references):
+            return key
+
+        codec, payload = CompressionUtils.compress(data)
+        try:
+            with db.begin_nested():
+                db.add(ContractBlob(
+                    hash=key,
+                    compression=codec,
+                    data=payload,
+                    size=len(data),
+                    ref_count=references
+                ))
+        except IntegrityError:
+            # Another transaction stored the same content first
+            self._add_references(db, key, references)
+
+        return key
+
+    def release(self, db: Session, key: Optional[str], references: int = 1):
+        """Drop references to a blob, deleting it once nothing points at it"""
+        if not key:
+            return
+
+        self._add_references(db, key, -references)
+        db.query(ContractBlob).filter(
+            ContractBlob.hash == key,
+            ContractBlob.ref_count <= 0
+        ).delete(synchronize_session=False)
+
+    def get(self, db: Session, key: str) -> Optional[str]:
+        blob = db.get(ContractBlob, key)
+        return blob.text if blob is not None else None
+
+    def _add_references(self, db: Session, key: str, references: int) -> bool:
+        updated = db.query(ContractBlob).filter(ContractBlob.hash == key).update(
+            {ContractBlob.ref_count: ContractBlob.ref_count + references},
+            synchronize_session=False
+        )
+        return updated > 0
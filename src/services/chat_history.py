@@ -0,0 +1,93 @@
+import hashlib
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from src.config import settings
+from src.utils.helpers import TTLCache
+from src.utils.prompts import prompts
+from src.utils.tokens import MESSAGE_OVERHEAD_TOKENS, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+CHAT_ROLES = ("user", "assistant")
+
+class ChatHistoryManager:
+    """Keeps chat history within a token budget by summarizing older turns
+
+    When the turns no longer fit, the oldest ones are folded into a running
+    summary, keeping only about half the budget of recent turns so the next
+    summarization is many turns away. Summaries are cached per caller and
+    conversation ID together with a hash of the turns they cover, so each turn
+    is summarized once and a summary is reused only for the exact history it
+    was made from. Without a conversation ID older turns are simply dropped.
+    """
+
+    def __init__(self, token_budget: Optional[int] = None, cache: Optional[TTLCache] = None):
+        self.token_budget = token_budget or settings.CHAT_HISTORY_TOKEN_BUDGET
+        self.summaries = cache or TTLCache(settings.CHAT_SUMMARY_CACHE_TTL_SECONDS, max_size=10000)
+
+    @staticmethod
+    def turns_hash(turns: List[Dict[str, Any]]) -> str:
+        payload = json.dumps(turns, separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def message_tokens(message: Dict[str, Any]) -> int:
+        return estimate_tokens(message["content"]) + MESSAGE_OVERHEAD_TOKENS
+
+    async def prepare(
+        self,
+        messages: List[Dict[str, Any]],
+        conversation_id: Optional[str],
+        summarize: Callable[[str], Awaitable[str]],
+        owner: Any = None
+    ) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+        """Returns (summary of earlier turns or None, recent turns to send verbatim)
+
+        owner identifies the caller; conversation IDs are only unique per owner.
+        """
+        turns = [
+            {"role": message["role"], "content": message["content"]}
+            for message in messages
+            if message.get("role") in CHAT_ROLES and message.get("content")
+        ]
+
+        cache_key = (owner, conversation_id)
+        covered, summary = 0, None
+        cached = self.summaries.get(cache_key) if conversation_id else None
+        # A shorter or edited history means the client reset or changed it
+        if cached is not None and cached[0] <= len(turns) and cached[1] == self.turns_hash(turns[:cached[0]]):
+            covered, _, summary = cached
+
+        sizes = [self.message_tokens(turn) for turn in turns]
+        summary_tokens = estimate_tokens(summary) if summary else 0
+        if sum(sizes[covered:]) + summary_tokens <= self.token_budget:
+            return summary, turns[covered:]
+
+        # Keep the newest turns within half the budget, and always the last one
+        keep_from = len(turns) - 1
+        kept_tokens = sizes[-1]
+        while keep_from > covered and kept_tokens + sizes[keep_from - 1] <= self.token_budget // 2:
+            keep_from -= 1
+            kept_tokens += sizes[keep_from]
+
+        if not conversation_id:
+            return None, turns[keep_from:]
+
+        # Nothing new to fold in: the newest turn alone is over budget, or the
+        # summary already covers everything before the kept turns
+        if keep_from == covered:
+            return summary, turns[keep_from:]
+
+        transcript = "\n\n".join(f"{turn['role']}: {turn['content']}" for turn in turns[covered:keep_from])
+        try:
+            summary = await summarize(prompts.get("chat_summary").render(
+                previous_summary=summary or "(none)",
+                transcript=transcript
+            ))
+        except Exception as e:
+            logger.warning(f"Conversation summary failed, dropping older turns: {str(e)}")
+            return summary, turns[keep_from:]
+
+        self.summaries.set(cache_key, (keep_from, self.turns_hash(turns[:keep_from]), summary))
+        return summary, turns[keep_from:]
@@ -2,19 +2,33 @@ import subprocess
 import json
 from typing import Dict, Any, Optional
 from src.config import settings
+from src.utils.rate_limit import quotas
 
 class FlowService:
     def __init__(self):
         self.network = settings.FLOW_NETWORK
         self.account_address = settings.FLOW_ACCOUNT_ADDRESS
+        self.deploy_quota = quotas.get(
+            "deploys_per_user_per_day",
+            settings.DEPLOYS_PER_USER_PER_DAY,
+            86400
+        )
 
     async def deploy_contract(
         self,
         contract_code: str,
         contract_name: str,
-        network: Optional[str] = None
+        network: Optional[str] = None,
+        user_id: Optional[int] = None
     ) -> Dict[str, Any]:
-        """Deploy contract to Flow blockchain"""
+        """Deploy contract to Flow blockchain
+
+        When user_id is given the call counts against the per-user deploy
+        quota and raises RateLimitExceeded once it is used up.
+        """
+        if user_id is not None:
+            self.deploy_quota.check(user_id)
+
         network = network or self.network
 
         try:
@@ -1,14 +1,75 @@
+from sqlalchemy import func
 from sqlalchemy.orm import Session
+from src.config import settings
 from src.models.learning import Documentation, LearningInsight, DeploymentLog
 from src.models.database import get_db
-from typing import List, Dict, Any, Optional
+from src.utils.helpers import TTLCache
+from src.utils.tokens import estimate_tokens
+from typing import List, Dict, Any, Optional, Tuple
+import hashlib
+import re
+import threading
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+_WHITESPACE_RUN = re.compile(r'\s+')
+
+def normalize_text(text: str) -> str:
+    return _WHITESPACE_RUN.sub(' ', text).strip().lower()
+
+def chunk_document(content: str, max_chars: int) -> List[str]:
+    """Split on blank lines and merge paragraphs into chunks of at most max_chars"""
+    chunks = []
+    current = ""
+    for paragraph in _PARAGRAPH_BREAK.split(content):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        while len(paragraph) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(paragraph[:max_chars])
+            paragraph = paragraph[max_chars:]
+        if current and len(current) + len(paragraph) + 2 > max_chars:
+            chunks.append(current)
+            current = ""
+        current = f"{current}\n\n{paragraph}" if current else paragraph
+    if current:
+        chunks.append(current)
+    return chunks
+
+class DocumentationIndex:
+    """TF-IDF matrix over documentation chunks, built once per corpus version"""
+
+    def __init__(self, signature: Tuple, chunks: List[Dict[str, Any]]):
+        self.signature = signature
+        self.chunks = chunks
+        self.vectorizer = None
+        self.matrix = None
+        if chunks:
+            self.vectorizer = TfidfVectorizer(stop_words='english', sublinear_tf=True)
+            try:
+                self.matrix = self.vectorizer.fit_transform([chunk["text"] for chunk in chunks])
+            except ValueError:
+                # Corpus made only of stop words
+                self.vectorizer = None
+
+    def rank(self, query: str) -> List[Tuple[float, Dict[str, Any]]]:
+        if self.vectorizer is None:
+            return []
+        similarities = cosine_similarity(self.vectorizer.transform([query]), self.matrix)[0]
+        order = np.argsort(similarities)[::-1]
+        return [(float(similarities[idx]), self.chunks[idx]) for idx in order]
+
 class LearningService:
     def __init__(self):
         self.vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
+        self._index: Optional[DocumentationIndex] = None
+        self._index_lock = threading.Lock()
+        self._retrieval_cache = TTLCache(settings.RAG_CACHE_TTL_SECONDS)
 
     async def search_documentation(
         self,
@@ -62,6 +123,79 @@ class LearningService:
 
             return results[:limit]
 
+    def retrieve_context(
+        self,
+        db: Session,
+        prompt: str,
+        top_k: Optional[int] = None,
+        token_budget: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Top documentation chunks for a generation prompt, packed into a token budget
+
+        Chunks below RAG_MIN_SCORE are dropped, duplicate text is kept once,
+        and chunks that would overflow the budget are skipped in favour of
+        smaller, lower-ranked ones. Results are cached per normalized prompt
+        until the corpus changes or the TTL expires.
+        """
+        top_k = top_k or settings.RAG_TOP_K
+        token_budget = token_budget or settings.RAG_TOKEN_BUDGET
+        index = self._get_index(db)
+
+        key = (index.signature, normalize_text(prompt), top_k, token_budget)
+        cached = self._retrieval_cache.get(key)
+        if cached is not None:
+            return cached
+
+        selected = []
+        seen = set()
+        used_tokens = 0
+        for score, chunk in index.rank(prompt):
+            if score < settings.RAG_MIN_SCORE or len(selected) >= top_k:
+                break
+            if chunk["digest"] in seen:
+                continue
+            tokens = estimate_tokens(chunk["text"])
+            if used_tokens + tokens > token_budget:
+                continue
+            seen.add(chunk["digest"])
+            used_tokens += tokens
+            selected.append({
+                "document_id": chunk["document_id"],
+                "title": chunk["title"],
+                "content": chunk["text"],
+                "relevance_score": score,
+                "tokens": tokens
+            })
+
+        self._retrieval_cache.set(key, selected)
+        return selected
+
+    def _get_index(self, db: Session) -> DocumentationIndex:
+        # One aggregate query tells whether any document was added, removed or edited
+        signature = tuple(db.query(
+            func.count(Documentation.id),
+            func.max(Documentation.id),
+            func.max(Documentation.updated_at)
+        ).one())
+
+        index = self._index
+        if index is not None and index.signature == signature:
+            return index
+
+        with self._index_lock:
+            if self._index is None or self._index.signature != signature:
+                chunks = []
+                for doc_id, title, content in db.query(Documentation.id, Documentation.title, Documentation.content):
+                    for text in chunk_document(content or "", settings.RAG_CHUNK_CHARS):
+                        chunks.append({
+                            "document_id": doc_id,
+                            "title": title,
+                            "text": text,
+                            "digest": hashlib.sha1(normalize_text(text).encode('utf-8')).hexdigest()
+                        })
+                self._index = DocumentationIndex(signature, chunks)
+            return self._index
+
     def add_documentation(
         self,
         db: Session,
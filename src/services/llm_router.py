@@ -0,0 +1,283 @@
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Dict, List, Optional
+from src.config import settings
+from src.utils.tokens import estimate_message_tokens, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+class LLMProvider(ABC):
+    """One backend the router can send a chat completion to
+
+    complete() returns a dict with content, provider, model, prompt_tokens,
+    completion_tokens and estimated, and raises on any failure.
+    """
+
+    def __init__(self, name: str, model: str):
+        self.name = name
+        self.model = model
+
+    @abstractmethod
+    async def complete(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        ...
+
+class ChatCompletionProvider(LLMProvider):
+    """Provider backed by an OpenAI-compatible client (openai, groq)"""
+
+    def __init__(self, name: str, client, model: str, temperature: float = 0.3, max_tokens: int = 4000):
+        super().__init__(name, model)
+        self.client = client
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+
+    async def complete(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        # The SDK clients are blocking; run them off the event loop so a slow
+        # provider can be hedged and other requests keep being served
+        response = await asyncio.to_thread(
+            self.client.chat.completions.create,
+            model=self.model,
+            messages=messages,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens
+        )
+        content = response.choices[0].message.content or ""
+
+        # Providers normally report usage; estimate locally when they don't
+        usage = getattr(response, "usage", None)
+        if usage is not None and usage.prompt_tokens is not None:
+            prompt_tokens, completion_tokens, estimated = usage.prompt_tokens, usage.completion_tokens or 0, False
+        else:
+            prompt_tokens = estimate_message_tokens(messages, self.model)
+            completion_tokens = estimate_tokens(content, self.model)
+            estimated = True
+
+        return {
+            "content": content,
+            "provider": self.name,
+            "model": self.model,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "estimated": estimated
+        }
+
+class ProviderStats:
+    """Rolling latency and error rate for one provider
+
+    After failure_threshold consecutive failures the provider is skipped for
+    cooldown_seconds; the next call after that is a probe, and one more
+    failure reopens the cooldown.
+    """
+
+    def __init__(self, window: int, failure_threshold: int, cooldown_seconds: float):
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        self.requests = 0
+        self.failures = 0
+
+    def record_success(self, latency: float):
+        self.requests += 1
+        self.latencies.append(latency)
+        self.outcomes.append(True)
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+
+    def record_abandoned(self, elapsed: float):
+        """A call cancelled before finishing (e.g. it lost a hedge) took at least elapsed"""
+        self.latencies.append(elapsed)
+
+    def record_failure(self):
+        self.requests += 1
+        self.failures += 1
+        self.outcomes.append(False)
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= self.failure_threshold:
+            self.cooldown_until = time.monotonic() + self.cooldown_seconds
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.cooldown_until
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    @property
+    def measured(self) -> bool:
+        return bool(self.latencies)
+
+    def expected_latency(self) -> float:
+        """Median latency inflated by the error rate; 0 until measured"""
+        median = self.percentile(0.5)
+        if median is None:
+            return 0.0
+        return median / max(1.0 - self.error_rate, 0.05)
+
+    def to_dict(self) -> Dict[str, Any]:
+        p50 = self.percentile(0.5)
+        p95 = self.percentile(0.95)
+        return {
+            "healthy": self.healthy,
+            "requests": self.requests,
+            "failures": self.failures,
+            "error_rate": round(self.error_rate, 4),
+            "consecutive_failures": self.consecutive_failures,
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "samples": len(self.latencies)
+        }
+
+class ProviderRouter:
+    """Sends each completion to the fastest healthy provider, failing over on errors
+
+    With hedging on, a second provider is started if the first has not
+    answered within its own p95 latency, and whichever finishes first wins.
+    A losing call is cancelled, but for thread-backed providers the request
+    still completes and is billed, so the winner's result lists an estimate
+    of its usage under "hedged".
+    """
+
+    def __init__(
+        self,
+        providers: List[LLMProvider],
+        hedge: Optional[bool] = None,
+        min_hedge_delay: Optional[float] = None,
+        window: Optional[int] = None,
+        failure_threshold: Optional[int] = None,
+        cooldown_seconds: Optional[float] = None
+    ):
+        self.providers = {provider.name: provider for provider in providers}
+        self.hedge = settings.LLM_HEDGE_ENABLED if hedge is None else hedge
+        self.min_hedge_delay = settings.LLM_HEDGE_MIN_DELAY_SECONDS if min_hedge_delay is None else min_hedge_delay
+        self.stats = {
+            name: ProviderStats(
+                window or settings.LLM_STATS_WINDOW,
+                failure_threshold or settings.LLM_FAILURE_THRESHOLD,
+                settings.LLM_PROVIDER_COOLDOWN_SECONDS if cooldown_seconds is None else cooldown_seconds
+            )
+            for name in self.providers
+        }
+
+    def candidates(self, preferred: Optional[str] = None) -> List[str]:
+        """Provider names in the order they should be tried
+
+        Healthy providers come first, a requested provider leads among them,
+        then measured providers by expected latency. Providers without
+        measurements go last in registration order, so the default provider
+        (registered first) is not displaced by one that was never tried.
+        """
+        position = {name: index for index, name in enumerate(self.providers)}
+        return sorted(
+            self.providers,
+            key=lambda name: (
+                not self.stats[name].healthy,
+                name != preferred,
+                not self.stats[name].measured,
+                self.stats[name].expected_latency(),
+                position[name]
+            )
+        )
+
+    def healthy(self) -> List[str]:
+        return [name for name in self.candidates() if self.stats[name].healthy]
+
+    def hedge_delay(self, name: str) -> float:
+        p95 = self.stats[name].percentile(0.95)
+        return max(self.min_hedge_delay, p95 or 0.0)
+
+    async def complete(self, messages: List[Dict[str, str]], preferred: Optional[str] = None) -> Dict[str, Any]:
+        if preferred is not None and preferred not in self.providers:
+            raise ValueError(f"Unsupported LLM provider: {preferred}")
+
+        remaining = self.candidates(preferred)
+        tried: List[str] = []
+        last_error: Optional[Exception] = None
+
+        while remaining:
+            attempted = len(tried)
+            primary = remaining[0]
+            backup = remaining[1] if self.hedge and len(remaining) > 1 else None
+            try:
+                if backup is None:
+                    tried.append(primary)
+                    return await self._call(primary, messages)
+                return await self._call_hedged(primary, backup, messages, tried)
+            except Exception as e:
+                last_error = e
+                logger.warning(f"LLM provider {' / '.join(tried[attempted:])} failed: {str(e)}")
+            remaining = [name for name in remaining if name not in tried]
+
+        raise last_error or RuntimeError("No LLM providers configured")
+
+    async def _call(self, name: str, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        stats = self.stats[name]
+        started_at = time.monotonic()
+        try:
+            result = await self.providers[name].complete(messages)
+        except asyncio.CancelledError:
+            stats.record_abandoned(time.monotonic() - started_at)
+            raise
+        except Exception:
+            stats.record_failure()
+            raise
+        stats.record_success(time.monotonic() - started_at)
+        return result
+
+    async def _call_hedged(self, primary: str, backup: str, messages: List[Dict[str, str]], tried: List[str]) -> Dict[str, Any]:
+        tried.append(primary)
+        names = [primary]
+        tasks = [asyncio.ensure_future(self._call(primary, messages))]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay(primary))
+            if not done:
+                tried.append(backup)
+                names.append(backup)
+                tasks.append(asyncio.ensure_future(self._call(backup, messages)))
+
+            pending = set(tasks)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        result = task.result()
+                        losers = [name for name, other in zip(names, tasks) if not other.done()]
+                        if losers:
+                            result = {**result, "hedged": [self._abandoned_usage(name, messages, result) for name in losers]}
+                        return result
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _abandoned_usage(self, name: str, messages: List[Dict[str, str]], winner: Dict[str, Any]) -> Dict[str, Any]:
+        """Estimated usage of a cancelled call, assuming it would have answered like the winner"""
+        model = self.providers[name].model
+        return {
+            "provider": name,
+            "model": model,
+            "prompt_tokens": estimate_message_tokens(messages, model),
+            "completion_tokens": winner["completion_tokens"],
+            "estimated": True
+        }
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {"model": self.providers[name].model, **self.stats[name].to_dict()}
+            for name in self.candidates()
+        }
@@ -1,69 +1,220 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy.orm import Session
 from src.config import settings
+from src.services.learning_service import LearningService
+from src.utils.cadence import extract_code_block
+from src.utils.prompts import prompts
+from src.utils.rate_limit import quotas
+from src.utils.single_flight import SingleFlight
+from src.utils.validators import ContractValidator
+from src.services.llm_router import ChatCompletionProvider, ProviderRouter
+from src.services.mock_llm import MockLLMProvider
+import asyncio
+import hashlib
+import json
+import logging
 import openai
 import groq
 
+logger = logging.getLogger(__name__)
+
+class ContractValidationError(Exception):
+    """The generated contract still failed validation after the repair attempts
+
+    generation holds the last attempt, including the tokens spent on all of them.
+    """
+
+    def __init__(self, errors: List[str], generation: Dict[str, Any]):
+        super().__init__("Generated contract failed validation: " + "; ".join(errors))
+        self.errors = errors
+        self.generation = generation
+
 class LLMService:
-    def __init__(self):
-        self.openai_client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
-        self.groq_client = groq.Groq(api_key=settings.GROQ_API_KEY)
+    OPENAI_MODEL = "gpt-4"
+    GROQ_MODEL = "llama-3.1-70b-versatile"
+
+    def __init__(self, learning_service: Optional[LearningService] = None):
+        self.learning_service = learning_service or LearningService()
         self.default_provider = settings.DEFAULT_LLM_PROVIDER
+        if settings.LLM_MOCK_ENABLED:
+            # No SDK clients and no API credits; see benchmarks/generation_load_test.py
+            self.openai_client = None
+            self.groq_client = None
+            self.default_provider = "MOCK"
+            self.router = ProviderRouter([MockLLMProvider.from_settings()])
+        else:
+            # Providers without an API key are not registered at all
+            self.openai_client = openai.OpenAI(api_key=settings.OPENAI_API_KEY) if settings.OPENAI_API_KEY else None
+            self.groq_client = groq.Groq(api_key=settings.GROQ_API_KEY) if settings.GROQ_API_KEY else None
+            providers = []
+            if self.openai_client is not None:
+                providers.append(ChatCompletionProvider("OPENAI", self.openai_client, self.OPENAI_MODEL))
+            if self.groq_client is not None:
+                providers.append(ChatCompletionProvider("GROQ", self.groq_client, self.GROQ_MODEL))
+            # The default provider goes first, so it is tried before any unmeasured one
+            providers.sort(key=lambda p: p.name != self.default_provider.upper())
+            self.router = ProviderRouter(providers)
+        self.in_flight = SingleFlight()
+        self.generation_quota = quotas.get(
+            "llm_generations_per_user_per_hour",
+            settings.LLM_GENERATIONS_PER_USER_PER_HOUR,
+            3600
+        )
+
+    @property
+    def async_openai_client(self) -> openai.AsyncOpenAI:
+        """Async OpenAI client for streaming callers such as the chat endpoints, created on first use"""
+        client = getattr(self, "_async_openai_client", None)
+        if client is None:
+            client = self._async_openai_client = openai.AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        return client
 
     async def generate_contract(
         self,
         prompt: str,
         provider: Optional[str] = None,
-        context: Optional[Dict[str, Any]] = None
+        context: Optional[Dict[str, Any]] = None,
+        user_id: Optional[int] = None,
+        db: Optional[Session] = None
     ) -> str:
-        """Generate Cadence smart contract from natural language prompt"""
-        provider = provider or self.default_provider
+        """Generate Cadence smart contract from natural language prompt
 
-        system_prompt = """You are an expert Cadence smart contract developer for the Flow blockchain.
-        Generate complete, secure, and efficient Cadence smart contracts based on user requirements.
-        Follow Flow blockchain best practices and include proper access control, resource management,
-        and error handling."""
-
-        user_prompt = f"""
-        Requirements: {prompt}
+        When user_id is given the call counts against the per-user generation
+        quota and raises RateLimitExceeded once it is used up. When db is
+        given, relevant documentation chunks are added to the prompt.
+        """
+        result = await self.generate(prompt, provider, context, user_id, db)
+        return result["content"]
 
-        Context: {context if context else 'No additional context provided'}
+    async def generate(
+        self,
+        prompt: str,
+        provider: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+        user_id: Optional[int] = None,
+        db: Optional[Session] = None,
+        validate: bool = False
+    ) -> Dict[str, Any]:
+        """Like generate_contract, but also returns provider, model and token usage
 
-        Generate a complete Cadence smart contract that meets these requirements.
-        Include proper comments and documentation.
+        With validate, the contract is extracted from the response's ```cadence
+        block into "code" and checked with ContractValidator; failures are sent
+        back to the model up to CONTRACT_REPAIR_ATTEMPTS times before
+        ContractValidationError is raised.
         """
+        if user_id is not None:
+            self.generation_quota.check(user_id)
+
+        documentation = await self._retrieve_documentation(db, prompt) if db is not None else []
+
+        messages, prompt_tokens = prompts.contract_messages(prompt, context, documentation)
+        logger.debug(f"Contract prompt tokens: {prompt_tokens}")
 
-        if provider.upper() == "OPENAI":
-            response = await self._generate_with_openai(system_prompt, user_prompt)
-        elif provider.upper() == "GROQ":
-            response = await self._generate_with_groq(system_prompt, user_prompt)
+        # An explicit provider is tried first; otherwise the router picks the
+        # fastest healthy one. Either way it fails over on errors.
+        preferred = provider.upper() if provider else None
+        if settings.LLM_COALESCE_ENABLED:
+            # Identical concurrent prompts share one provider call (and repair
+            # loop); the callers that reused it consumed no tokens of their own
+            key = (self._request_key(messages, preferred), validate)
+            (result, error), shared = await self.in_flight.do(
+                key, lambda: self._complete_or_error(messages, preferred, validate)
+            )
+            if error is not None:
+                if shared:
+                    raise ContractValidationError(error.errors, self._as_shared(error.generation))
+                raise error
+            if shared:
+                result = self._as_shared(result)
         else:
-            raise ValueError(f"Unsupported LLM provider: {provider}")
-
-        return response
-
-    async def _generate_with_openai(self, system_prompt: str, user_prompt: str) -> str:
-        response = self.openai_client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.3,
-            max_tokens=4000
-        )
-        return response.choices[0].message.content
-
-    async def _generate_with_groq(self, system_prompt: str, user_prompt: str) -> str:
-        response = self.groq_client.chat.completions.create(
-            model="llama2-70b-4096",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.3,
-            max_tokens=4000
-        )
-        return response.choices[0].message.content
+            result = await self._complete(messages, preferred, validate)
+
+        return {
+            **result,
+            "documentation_ids": [chunk["document_id"] for chunk in documentation],
+            "prompt_layout": prompt_tokens
+        }
+
+    async def _complete(self, messages: List[Dict[str, str]], preferred: Optional[str], validate: bool) -> Dict[str, Any]:
+        result = await self.router.complete(messages, preferred=preferred)
+        if not validate:
+            return result
+
+        prompt_tokens = result["prompt_tokens"]
+        completion_tokens = result["completion_tokens"]
+        hedged = list(result.get("hedged", []))
+        attempts = 0
+        while True:
+            code = extract_code_block(result["content"])
+            validation = ContractValidator.validate_cadence_contract(code)
+            if validation["is_valid"] or attempts >= settings.CONTRACT_REPAIR_ATTEMPTS:
+                break
+
+            attempts += 1
+            logger.info(f"Generated contract failed validation, repair attempt {attempts}: {validation['errors']}")
+            result = await self.router.complete(
+                prompts.repair_messages(messages, result["content"], validation["errors"]),
+                preferred=preferred
+            )
+            prompt_tokens += result["prompt_tokens"]
+            completion_tokens += result["completion_tokens"]
+            hedged += result.get("hedged", [])
+
+        result = {
+            **result,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "hedged": hedged,
+            "code": code,
+            "validation": {"errors": validation["errors"], "warnings": validation["warnings"]},
+            "repair_attempts": attempts
+        }
+        if not validation["is_valid"]:
+            raise ContractValidationError(validation["errors"], result)
+        return result
+
+    async def _complete_or_error(
+        self,
+        messages: List[Dict[str, str]],
+        preferred: Optional[str],
+        validate: bool
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[ContractValidationError]]:
+        # A rejected contract is returned rather than raised, so coalesced
+        # callers still learn from do() whether they shared the flight
+        try:
+            return await self._complete(messages, preferred, validate), None
+        except ContractValidationError as e:
+            return None, e
+
+    @staticmethod
+    def _as_shared(result: Dict[str, Any]) -> Dict[str, Any]:
+        return {**result, "prompt_tokens": 0, "completion_tokens": 0, "hedged": [], "coalesced": True}
+
+    @staticmethod
+    def _request_key(messages: List[Dict[str, str]], preferred: Optional[str]) -> str:
+        # Whitespace differences alone should not split otherwise identical requests
+        normalized = [[message["role"], " ".join(message["content"].split())] for message in messages]
+        payload = json.dumps([preferred, normalized], separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def _retrieve_documentation(self, db: Session, prompt: str) -> List[Dict[str, Any]]:
+        if not settings.RAG_ENABLED:
+            return []
+        try:
+            # Building the index and scoring are CPU-bound; run them off the
+            # event loop with their own session on the caller's database
+            return await asyncio.to_thread(self._retrieve_in_thread, db.get_bind(), prompt)
+        except Exception as e:
+            # Retrieval only improves the prompt; never fail a generation over it
+            logger.warning(f"Documentation retrieval failed: {str(e)}")
+            return []
+
+    def _retrieve_in_thread(self, bind, prompt: str) -> List[Dict[str, Any]]:
+        with Session(bind) as db:
+            return self.learning_service.retrieve_context(db, prompt)
+
+    def get_provider_stats(self) -> Dict[str, Dict[str, Any]]:
+        return self.router.get_stats()
 
     async def optimize_contract(self, contract_code: str) -> str:
         """Optimize existing Cadence contract for better performance and security"""
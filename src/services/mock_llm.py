@@ -0,0 +1,168 @@
+import asyncio
+import math
+import random
+import zlib
+from typing import Any, Dict, List, Optional
+from src.config import settings
+from src.services.llm_router import LLMProvider
+from src.utils.tokens import estimate_message_tokens, estimate_tokens
+
+CANNED_CONTRACTS = [
+    '''```cadence
+// ExampleToken: a minimal fungible token
+access(all) contract ExampleToken {
+
+    access(all) var totalSupply: UFix64
+
+    access(all) event TokensWithdrawn(amount: UFix64, from: Address?)
+    access(all) event TokensDeposited(amount: UFix64, to: Address?)
+
+    access(all) resource Vault {
+        access(all) var balance: UFix64
+
+        init(balance: UFix64) {
+            self.balance = balance
+        }
+
+        access(all) fun withdraw(amount: UFix64): @Vault {
+            pre {
+                amount <= self.balance: "Insufficient balance"
+            }
+            self.balance = self.balance - amount
+            emit TokensWithdrawn(amount: amount, from: self.owner?.address)
+            return <-create Vault(balance: amount)
+        }
+
+        access(all) fun deposit(from: @Vault) {
+            let amount = from.balance
+            self.balance = self.balance + amount
+            emit TokensDeposited(amount: amount, to: self.owner?.address)
+            destroy from
+        }
+    }
+
+    access(all) fun createEmptyVault(): @Vault {
+        return <-create Vault(balance: 0.0)
+    }
+
+    init() {
+        self.totalSupply = 1000.0
+    }
+}
+```''',
+    '''```cadence
+// ExampleNFT: a minimal non-fungible token collection
+access(all) contract ExampleNFT {
+
+    access(all) var totalSupply: UInt64
+
+    access(all) event Minted(id: UInt64)
+
+    access(all) resource NFT {
+        access(all) let id: UInt64
+
+        init(id: UInt64) {
+            self.id = id
+        }
+    }
+
+    access(all) resource Collection {
+        access(all) var ownedNFTs: @{UInt64: NFT}
+
+        init() {
+            self.ownedNFTs <- {}
+        }
+
+        access(all) fun deposit(token: @NFT) {
+            let old <- self.ownedNFTs[token.id] <- token
+            destroy old
+        }
+
+        access(all) fun getIDs(): [UInt64] {
+            return self.ownedNFTs.keys
+        }
+    }
+
+    access(all) fun mint(): @NFT {
+        self.totalSupply = self.totalSupply + 1
+        emit Minted(id: self.totalSupply)
+        return <-create NFT(id: self.totalSupply)
+    }
+
+    access(all) fun createEmptyCollection(): @Collection {
+        return <-create Collection()
+    }
+
+    init() {
+        self.totalSupply = 0
+    }
+}
+```''',
+]
+
+class MockProviderError(Exception):
+    pass
+
+class MockLLMProvider(LLMProvider):
+    """Offline stand-in for a real provider, for load tests and local development
+
+    Each call waits a log-normally distributed time to first token, then
+    "streams" a canned contract at tokens_per_second, and fails with
+    probability error_rate. The output is chosen by a hash of the last
+    message, so identical prompts get identical answers.
+    """
+
+    def __init__(
+        self,
+        name: str = "MOCK",
+        model: str = "mock-cadence",
+        tokens_per_second: float = 200.0,
+        latency_median_seconds: float = 0.5,
+        latency_sigma: float = 0.5,
+        error_rate: float = 0.0,
+        outputs: Optional[List[str]] = None,
+        seed: Optional[int] = None
+    ):
+        super().__init__(name, model)
+        self.tokens_per_second = tokens_per_second
+        self.latency_median_seconds = latency_median_seconds
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.outputs = outputs or CANNED_CONTRACTS
+        self.random = random.Random(seed)
+
+    @classmethod
+    def from_settings(cls) -> "MockLLMProvider":
+        return cls(
+            tokens_per_second=settings.LLM_MOCK_TOKENS_PER_SECOND,
+            latency_median_seconds=settings.LLM_MOCK_LATENCY_MEDIAN_SECONDS,
+            latency_sigma=settings.LLM_MOCK_LATENCY_SIGMA,
+            error_rate=settings.LLM_MOCK_ERROR_RATE
+        )
+
+    def time_to_first_token(self) -> float:
+        if self.latency_median_seconds <= 0:
+            return 0.0
+        return self.random.lognormvariate(math.log(self.latency_median_seconds), self.latency_sigma)
+
+    async def complete(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        first_token = self.time_to_first_token()
+        if self.random.random() < self.error_rate:
+            await asyncio.sleep(first_token)
+            raise MockProviderError("Simulated provider error")
+
+        prompt = messages[-1]["content"] if messages else ""
+        content = self.outputs[zlib.crc32(prompt.encode("utf-8")) % len(self.outputs)]
+        completion_tokens = estimate_tokens(content, self.model)
+
+        generation = completion_tokens / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+        await asyncio.sleep(first_token + generation)
+
+        return {
+            "content": content,
+            "provider": self.name,
+            "model": self.model,
+            "prompt_tokens": estimate_message_tokens(messages, self.model),
+            "completion_tokens": completion_tokens,
+            "estimated": False
+        }
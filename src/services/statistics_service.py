@@ -0,0 +1,103 @@
+from typing import Any, Dict
+from sqlalchemy import case, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from src.config import settings
+from src.models.contract import ContractSubmission, Deployment, UserStatistics
+from src.utils.helpers import TTLCache
+
+COUNTER_FIELDS = ("total_submissions", "total_deployments", "successful_deployments", "total_gas_used")
+
+class StatisticsService:
+    def __init__(self):
+        self.cache = TTLCache(settings.STATISTICS_CACHE_TTL_SECONDS)
+
+    def record_submission(self, db: Session, user_id: int, count: int = 1):
+        """Count new (or, with a negative count, deleted) submissions; call before committing"""
+        self._increment(db, user_id, {"total_submissions": count})
+
+    def record_deployment(self, db: Session, user_id: int, succeeded: bool, gas_used: int = 0):
+        """Count a deployment; call before committing the deployment row"""
+        self._increment(db, user_id, {
+            "total_deployments": 1,
+            "successful_deployments": 1 if succeeded else 0,
+            "total_gas_used": gas_used or 0
+        })
+
+    def get_user_statistics(self, db: Session, user_id: int) -> Dict[str, Any]:
+        """Dashboard statistics from the cache or the counters row"""
+        stats = self.cache.get(user_id)
+        if stats is not None:
+            return stats
+
+        counters = db.get(UserStatistics, user_id)
+        if counters is None:
+            # The row is created by the user's first write, so there is nothing to count
+            counters = UserStatistics(user_id=user_id, **{field: 0 for field in COUNTER_FIELDS})
+
+        stats = self._format(counters)
+        self.cache.set(user_id, stats)
+        return stats
+
+    def rebuild(self, db: Session, user_id: int) -> UserStatistics:
+        """Recompute a user's counters from raw rows in one conditional-aggregate query
+
+        For backfilling or repairing a counters row; the record_* calls keep
+        it current afterwards.
+        """
+        submissions = select(func.count(ContractSubmission.id)).where(
+            ContractSubmission.user_id == user_id
+        ).scalar_subquery()
+        row = db.query(
+            submissions,
+            func.count(Deployment.id),
+            func.coalesce(func.sum(case((Deployment.status == "DEPLOYED", 1), else_=0)), 0),
+            func.coalesce(func.sum(Deployment.gas_used), 0)
+        ).filter(Deployment.user_id == user_id).one()
+
+        counters = db.get(UserStatistics, user_id)
+        if counters is None:
+            counters = UserStatistics(user_id=user_id)
+            db.add(counters)
+        for field, value in zip(COUNTER_FIELDS, row):
+            setattr(counters, field, int(value or 0))
+
+        try:
+            db.commit()
+        except IntegrityError:
+            # A concurrent write created the row; its counters are authoritative
+            db.rollback()
+            counters = db.get(UserStatistics, user_id)
+
+        self.cache.invalidate(user_id)
+        return counters
+
+    def _increment(self, db: Session, user_id: int, deltas: Dict[str, int]):
+        if not self._add_deltas(db, user_id, deltas):
+            # First write for this user: the row starts at the deltas
+            try:
+                with db.begin_nested():
+                    db.add(UserStatistics(user_id=user_id, **{field: deltas.get(field, 0) for field in COUNTER_FIELDS}))
+            except IntegrityError:
+                # A concurrent first write created the row
+                self._add_deltas(db, user_id, deltas)
+        self.cache.invalidate(user_id)
+
+    @staticmethod
+    def _add_deltas(db: Session, user_id: int, deltas: Dict[str, int]) -> bool:
+        updated = db.query(UserStatistics).filter(UserStatistics.user_id == user_id).update(
+            {getattr(UserStatistics, field): getattr(UserStatistics, field) + delta for field, delta in deltas.items()},
+            synchronize_session=False
+        )
+        return updated > 0
+
+    @staticmethod
+    def _format(counters: UserStatistics) -> Dict[str, Any]:
+        total_deployments = counters.total_deployments
+        return {
+            "total_submissions": counters.total_submissions,
+            "total_deployments": total_deployments,
+            "successful_deployments": counters.successful_deployments,
+            "total_gas_used": counters.total_gas_used,
+            "success_rate": counters.successful_deployments / total_deployments if total_deployments > 0 else 0
+        }
@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from src.config import settings
+from src.models.usage import LLMUsage
+from src.utils.rate_limit import RateLimitExceeded
+
+# USD per million (prompt, completion) tokens
+MODEL_PRICING: Dict[str, Tuple[float, float]] = {
+    "gpt-4": (30.0, 60.0),
+    "gpt-4o": (2.5, 10.0),
+    "gpt-4o-mini": (0.15, 0.6),
+    "llama2-70b-4096": (0.7, 0.8),
+    "llama-3.1-70b-versatile": (0.59, 0.79),
+}
+
+class BudgetExceeded(RateLimitExceeded):
+    pass
+
+class UsageService:
+    """Records per-call token usage and enforces daily per-user budgets
+
+    Like the other counters, rows are added to the caller's transaction and
+    never committed here.
+    """
+
+    def __init__(self):
+        self.daily_token_budget = settings.LLM_DAILY_TOKEN_BUDGET_PER_USER
+        self.daily_cost_budget_microusd = int(settings.LLM_DAILY_COST_BUDGET_USD * 1_000_000)
+
+    @staticmethod
+    def cost_microusd(model: str, prompt_tokens: int, completion_tokens: int) -> int:
+        prompt_price, completion_price = MODEL_PRICING.get(model, (0.0, 0.0))
+        # Price per million tokens is exactly micro-dollars per token
+        return round(prompt_tokens * prompt_price + completion_tokens * completion_price)
+
+    def record(
+        self,
+        db: Session,
+        user_id: int,
+        usage: Dict[str, Any],
+        submission_id: Optional[int] = None
+    ) -> LLMUsage:
+        """Add usage rows for one generation result from LLMService.generate
+
+        Hedged calls that lost the race get rows of their own; the row for
+        the answer itself is returned.
+        """
+        row = self._row(user_id, usage, submission_id)
+        db.add(row)
+        for hedged in usage.get("hedged", ()):
+            db.add(self._row(user_id, hedged, submission_id))
+        return row
+
+    def _row(self, user_id: int, usage: Dict[str, Any], submission_id: Optional[int]) -> LLMUsage:
+        return LLMUsage(
+            user_id=user_id,
+            submission_id=submission_id,
+            provider=usage["provider"],
+            model=usage["model"],
+            prompt_tokens=usage["prompt_tokens"],
+            completion_tokens=usage["completion_tokens"],
+            cost_microusd=self.cost_microusd(usage["model"], usage["prompt_tokens"], usage["completion_tokens"]),
+            estimated=usage.get("estimated", False)
+        )
+
+    def get_daily_usage(self, db: Session, user_id: int) -> Dict[str, int]:
+        """Tokens and cost since UTC midnight, read through the (user_id, created_at) index"""
+        tokens, cost = db.query(
+            func.coalesce(func.sum(LLMUsage.prompt_tokens + LLMUsage.completion_tokens), 0),
+            func.coalesce(func.sum(LLMUsage.cost_microusd), 0)
+        ).filter(
+            LLMUsage.user_id == user_id,
+            LLMUsage.created_at >= self._day_start()
+        ).one()
+        return {"tokens": int(tokens), "cost_microusd": int(cost)}
+
+    def check_budget(self, db: Session, user_id: int):
+        """Raise BudgetExceeded if the user has used up today's token or cost budget"""
+        usage = self.get_daily_usage(db, user_id)
+        if usage["tokens"] >= self.daily_token_budget:
+            raise BudgetExceeded("llm_daily_token_budget", self._seconds_until_reset())
+        if usage["cost_microusd"] >= self.daily_cost_budget_microusd:
+            raise BudgetExceeded("llm_daily_cost_budget", self._seconds_until_reset())
+
+    @staticmethod
+    def _day_start() -> datetime:
+        return datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    def _seconds_until_reset(self) -> float:
+        return (self._day_start() + timedelta(days=1) - datetime.utcnow()).total_seconds()
@@ -0,0 +1,115 @@
+import asyncio
+import io
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from src.config import settings
+from src.utils.helpers import FileUtils
+from src.utils.validators import ContractValidator
+
+def validate_contract_source(name: str, code: str) -> Dict[str, Any]:
+    """Validate one contract; runs inside a worker process"""
+    start = time.perf_counter()
+    extension = FileUtils.get_file_extension(name)
+    if extension == '.sol':
+        result = ContractValidator.validate_solidity_contract(code)
+    else:
+        result = ContractValidator.validate_cadence_contract(code)
+
+    return {
+        "name": name,
+        "is_valid": result["is_valid"],
+        "errors": result["errors"],
+        "warnings": result["warnings"],
+        "size": len(code),
+        "duration_ms": round((time.perf_counter() - start) * 1000, 3)
+    }
+
+def validate_contract_chunk(contracts: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+    """Validate a chunk of contracts in one worker round trip"""
+    return [validate_contract_source(name, code) for name, code in contracts]
+
+class ValidationService:
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or settings.VALIDATION_WORKERS or os.cpu_count() or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def extract_contracts_from_zip(self, data: bytes) -> List[Tuple[str, str]]:
+        """Read .cdc/.sol members of a zip archive, enforcing count and size limits"""
+        contracts = []
+        total_size = 0
+
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            for info in archive.infolist():
+                if info.is_dir() or not FileUtils.is_valid_contract_file(info.filename):
+                    continue
+                if len(contracts) >= settings.MAX_BATCH_CONTRACTS:
+                    raise ValueError(f"Archive contains more than {settings.MAX_BATCH_CONTRACTS} contracts")
+
+                # Declared sizes can lie, so the read itself is bounded too
+                total_size += info.file_size
+                if total_size > settings.MAX_BATCH_TOTAL_SIZE:
+                    raise ValueError("Archive exceeds the maximum uncompressed size")
+                with archive.open(info) as member:
+                    content = member.read(info.file_size + 1)
+                if len(content) > info.file_size:
+                    raise ValueError(f"Archive member {info.filename} is larger than declared")
+
+                contracts.append((info.filename, content.decode('utf-8')))
+
+        return contracts
+
+    async def validate_batch(self, contracts: List[Tuple[str, str]]) -> AsyncIterator[Dict[str, Any]]:
+        """Validate contracts across the process pool, yielding results as they finish
+
+        Every per-contract result has type "result"; the last item has type
+        "summary" and reports aggregate counts and throughput.
+        """
+        start = time.perf_counter()
+        total = len(contracts)
+        valid = 0
+        total_bytes = 0
+
+        # A few chunks per worker keeps all cores busy without paying one
+        # pickling round trip per small contract
+        chunk_size = max(1, total // (self.max_workers * 4))
+        loop = asyncio.get_running_loop()
+        pending = [
+            loop.run_in_executor(self.executor, validate_contract_chunk, contracts[i:i + chunk_size])
+            for i in range(0, total, chunk_size)
+        ]
+
+        try:
+            for future in asyncio.as_completed(pending):
+                for result in await future:
+                    valid += result["is_valid"]
+                    total_bytes += result["size"]
+                    yield {"type": "result", **result}
+        finally:
+            for future in pending:
+                future.cancel()
+
+        elapsed = time.perf_counter() - start
+        yield {
+            "type": "summary",
+            "total": total,
+            "valid": valid,
+            "invalid": total - valid,
+            "workers": self.max_workers,
+            "elapsed_seconds": round(elapsed, 4),
+            "contracts_per_second": round(total / elapsed, 2) if elapsed > 0 else None,
+            "bytes_per_second": round(total_bytes / elapsed, 2) if elapsed > 0 else None
+        }
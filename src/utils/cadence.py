@@ -0,0 +1,253 @@
+import re
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional
+
+# One compiled pattern covers every token class; comments and strings are
+# consumed whole so keywords inside them never count as code.
+TOKEN_PATTERN = re.compile(r'''
+    (?P<ws>\s+)
+  | (?P<line_comment>//[^\n]*)
+  | (?P<block_comment>/\*)
+  | (?P<string>"(?:[^"\\\n]|\\.)*")
+  | (?P<bad_string>"[^\n]*)
+  | (?P<number>0x[0-9a-fA-F_]+|\d[\d_]*(?:\.\d+)?)
+  | (?P<ident>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<punct>[{}()\[\]])
+  | (?P<other>.)
+''', re.VERBOSE | re.DOTALL)
+
+COMMENT_DELIMITERS = re.compile(r'/\*|\*/')
+
+# Fenced markdown code blocks, as LLM responses wrap code
+CODE_BLOCK_PATTERN = re.compile(r'```[ \t]*([A-Za-z0-9_+-]*)[^\n]*\n(.*?)(?:```|\Z)', re.DOTALL)
+
+BRACKET_PAIRS = {')': '(', ']': '[', '}': '{'}
+
+DECLARATION_KEYWORDS = ('contract', 'resource', 'struct', 'event', 'enum', 'attachment')
+
+CADENCE_KEYWORDS = frozenset((
+    'access', 'all', 'attachment', 'auth', 'contract', 'create', 'destroy', 'emit',
+    'entitlement', 'enum', 'event', 'fun', 'if', 'import', 'init', 'interface',
+    'let', 'move', 'panic', 'post', 'pre', 'priv', 'pub', 'resource', 'return',
+    'self', 'struct', 'transaction', 'var', 'view', 'while', 'for', 'in',
+))
+
+class CadenceToken:
+    __slots__ = ('kind', 'value', 'pos')
+
+    def __init__(self, kind: str, value: str, pos: int):
+        self.kind = kind
+        self.value = value
+        self.pos = pos
+
+class CadenceAnalyzer:
+    """Single-pass tokenizer and structural analyzer for Cadence source"""
+
+    @staticmethod
+    def tokenize(code: str, errors: Optional[List[str]] = None) -> List[CadenceToken]:
+        """Split code into identifier, number, string and bracket tokens
+
+        Whitespace and comments (including nested block comments) are dropped.
+        Lexical problems are appended to errors when a list is given.
+        """
+        tokens = []
+        pos = 0
+        length = len(code)
+        match = TOKEN_PATTERN.match
+
+        while pos < length:
+            m = match(code, pos)
+            kind = m.lastgroup
+            end = m.end()
+
+            if kind == 'block_comment':
+                depth = 1
+                while depth:
+                    delimiter = COMMENT_DELIMITERS.search(code, end)
+                    if delimiter is None:
+                        if errors is not None:
+                            errors.append(f"Unterminated block comment starting on line {CadenceAnalyzer.line_of(code, pos)}")
+                        end = length
+                        break
+                    depth += 1 if delimiter.group() == '/*' else -1
+                    end = delimiter.end()
+            elif kind == 'bad_string':
+                if errors is not None:
+                    errors.append(f"Unterminated string literal on line {CadenceAnalyzer.line_of(code, pos)}")
+                tokens.append(CadenceToken('string', m.group(), pos))
+            elif kind not in ('ws', 'line_comment'):
+                tokens.append(CadenceToken(kind, m.group(), pos))
+
+            pos = end
+
+        return tokens
+
+    @staticmethod
+    def line_of(code: str, pos: int) -> int:
+        return code.count('\n', 0, pos) + 1
+
+    @staticmethod
+    def analyze(code: str) -> Dict[str, Any]:
+        """Walk the token stream once and summarize the contract structure"""
+        errors: List[str] = []
+        tokens = CadenceAnalyzer.tokenize(code, errors)
+        newlines = [m.start() for m in re.finditer('\n', code)]
+
+        def line_of(pos: int) -> int:
+            return bisect_right(newlines, pos - 1) + 1
+
+        summary = {
+            "contracts": [],
+            "contract_interfaces": [],
+            "resources": [],
+            "resource_interfaces": [],
+            "structs": [],
+            "events": [],
+            "functions": [],
+            "imports": [],
+            "access_modifiers": {},
+            "keywords": set(),
+            "pre_conditions": 0,
+            "post_conditions": 0,
+            "panic_calls": 0,
+            "syntax_errors": errors,
+        }
+
+        # Open brackets as (char, position, function index or None)
+        brackets = []
+        pending_access = None
+        pending_function = None
+        count = len(tokens)
+        i = 0
+
+        while i < count:
+            token = tokens[i]
+            value = token.value
+
+            if token.kind == 'punct':
+                if value in '([{':
+                    owner = None
+                    if value == '{' and pending_function is not None:
+                        owner = pending_function
+                        pending_function = None
+                    brackets.append((value, token.pos, owner))
+                else:
+                    expected = BRACKET_PAIRS[value]
+                    if not brackets or brackets[-1][0] != expected:
+                        errors.append(f"Unmatched '{value}' on line {line_of(token.pos)}")
+                    else:
+                        brackets.pop()
+                i += 1
+                continue
+
+            if token.kind != 'ident':
+                i += 1
+                continue
+
+            if value in CADENCE_KEYWORDS:
+                summary["keywords"].add(value)
+            next_value = tokens[i + 1].value if i + 1 < count else None
+
+            if value in ('pub', 'priv'):
+                pending_access = value
+                if next_value == '(' and i + 3 < count and tokens[i + 3].value == ')':
+                    # pub(set) and friends
+                    pending_access = f"{value}({tokens[i + 2].value})"
+                    i += 3
+                summary["access_modifiers"][pending_access] = summary["access_modifiers"].get(pending_access, 0) + 1
+            elif value == 'access' and next_value == '(':
+                close = i + 2
+                while close < count and tokens[close].value != ')':
+                    close += 1
+                pending_access = "access(" + " ".join(t.value for t in tokens[i + 2:close]) + ")"
+                summary["access_modifiers"][pending_access] = summary["access_modifiers"].get(pending_access, 0) + 1
+                i = close
+            elif value == 'import':
+                j = i + 1
+                while j < count and tokens[j].kind == 'ident' and tokens[j].value != 'from':
+                    summary["imports"].append(tokens[j].value)
+                    j += 1
+                i = j
+                continue
+            elif value in DECLARATION_KEYWORDS and next_value is not None:
+                is_interface = next_value == 'interface'
+                name_index = i + 2 if is_interface else i + 1
+                if name_index < count and tokens[name_index].kind == 'ident':
+                    entry = {
+                        "name": tokens[name_index].value,
+                        "access": pending_access,
+                        "line": line_of(token.pos),
+                    }
+                    if value == 'contract':
+                        summary["contract_interfaces" if is_interface else "contracts"].append(entry)
+                    elif value == 'resource':
+                        summary["resource_interfaces" if is_interface else "resources"].append(entry)
+                    elif value == 'struct' and not is_interface:
+                        summary["structs"].append(entry)
+                    elif value == 'event':
+                        summary["events"].append(entry)
+                    pending_access = None
+                    pending_function = None
+                    i = name_index + 1
+                    continue
+            elif value == 'fun' or (value == 'init' and next_value == '(' and not brackets_inside_function(brackets)):
+                name = value
+                if value == 'fun' and next_value is not None and tokens[i + 1].kind == 'ident':
+                    name = next_value
+                    i += 1
+                summary["functions"].append({
+                    "name": name,
+                    "access": pending_access,
+                    "line": line_of(token.pos),
+                    "has_pre": False,
+                    "has_post": False,
+                })
+                pending_function = len(summary["functions"]) - 1
+                pending_access = None
+            elif value in ('pre', 'post') and next_value == '{':
+                summary["pre_conditions" if value == 'pre' else "post_conditions"] += 1
+                owner = current_function(brackets)
+                if owner is not None:
+                    summary["functions"][owner]["has_" + value] = True
+            elif value == 'panic' and next_value == '(':
+                summary["panic_calls"] += 1
+            elif value in ('let', 'var'):
+                pending_access = None
+                pending_function = None
+
+            i += 1
+
+        for bracket, pos, _ in brackets:
+            errors.append(f"Unclosed '{bracket}' opened on line {line_of(pos)}")
+
+        summary["keywords"] = sorted(summary["keywords"])
+        return summary
+
+def current_function(brackets: list) -> Optional[int]:
+    """Index of the innermost function whose body is open, if any"""
+    for _, _, owner in reversed(brackets):
+        if owner is not None:
+            return owner
+    return None
+
+def brackets_inside_function(brackets: list) -> bool:
+    return current_function(brackets) is not None
+
+def extract_code_block(text: str, language: str = "cadence") -> str:
+    """The contract code in an LLM response
+
+    Prefers a block fenced as language that declares a contract, then any
+    such block, then the longest fenced block; text with no fences is
+    returned as is.
+    """
+    blocks = [(lang.lower(), body.strip()) for lang, body in CODE_BLOCK_PATTERN.findall(text)]
+    if not blocks:
+        return text.strip()
+
+    tagged = [body for lang, body in blocks if lang == language]
+    for body in tagged:
+        if re.search(r'\bcontract\b', body):
+            return body
+    if tagged:
+        return tagged[0]
+    return max((body for _, body in blocks), key=len)
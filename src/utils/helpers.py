@@ -1,10 +1,21 @@
+import base64
+import codecs
+import hashlib
 import json
 import uuid
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, AsyncIterator, List, Optional
 import os
+import time
+import zlib
+from collections import OrderedDict
 import logging
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 logger = logging.getLogger(__name__)
 
 class IDGenerator:
@@ -93,6 +104,104 @@ class FileUtils:
             logger.error(f"Error writing file {file_path}: {str(e)}")
             return False
 
+class UploadTooLargeError(ValueError):
+    pass
+
+class StreamingUploadReader:
+    """Reads an upload chunk by chunk with a size cap, incremental UTF-8 decoding and hashing"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.size = 0
+        self.hasher = hashlib.sha256()
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.parts: List[str] = []
+
+    def feed(self, chunk: bytes):
+        """Consume one chunk, rejecting the upload as soon as it is too large or not text"""
+        self.size += len(chunk)
+        if self.size > self.max_size:
+            raise UploadTooLargeError(f"Upload exceeds the maximum size of {self.max_size} bytes")
+
+        self.hasher.update(chunk)
+        text = self.decoder.decode(chunk)
+        if '\x00' in text:
+            raise ValueError("Binary content is not allowed")
+        self.parts.append(text)
+
+    def finish(self) -> str:
+        self.parts.append(self.decoder.decode(b'', final=True))
+        text = ''.join(self.parts)
+        self.parts = []
+        return text
+
+    @property
+    def content_hash(self) -> str:
+        return self.hasher.hexdigest()
+
+    async def read(self, chunks: AsyncIterator[bytes]) -> str:
+        async for chunk in chunks:
+            self.feed(chunk)
+        return self.finish()
+
+class CompressionUtils:
+    @staticmethod
+    def compress(data: bytes) -> tuple:
+        """Compress data with zstd when available, else zlib; returns (codec, payload)"""
+        if zstandard is not None:
+            codec, payload = "zstd", zstandard.ZstdCompressor(level=10).compress(data)
+        else:
+            codec, payload = "zlib", zlib.compress(data, 9)
+
+        # Tiny inputs can grow when compressed
+        if len(payload) >= len(data):
+            return "none", data
+        return codec, payload
+
+    @staticmethod
+    def decompress(codec: str, payload: bytes) -> bytes:
+        """Reverse CompressionUtils.compress"""
+        if codec == "none":
+            return payload
+        if codec == "zlib":
+            return zlib.decompress(payload)
+        if codec == "zstd":
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read zstd-compressed data")
+            return zstandard.ZstdDecompressor().decompress(payload)
+        raise ValueError(f"Unknown compression codec: {codec}")
+
+class TTLCache:
+    """Small in-memory cache whose entries expire after ttl_seconds (LRU-bounded)"""
+
+    def __init__(self, ttl_seconds: float, max_size: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.entries: "OrderedDict[Any, tuple]" = OrderedDict()
+
+    def get(self, key: Any) -> Any:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return value
+
+    def set(self, key: Any, value: Any):
+        self.entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, key: Any):
+        self.entries.pop(key, None)
+
+    def clear(self):
+        self.entries.clear()
+
 class NetworkUtils:
     @staticmethod
     def get_flow_network_config(network: str) -> Dict[str, Any]:
@@ -164,8 +273,19 @@ class ResponseFormatter:
         }
 
     @staticmethod
-    def paginated_response(items: List[Any], total: int, page: int, page_size: int) -> Dict[str, Any]:
-        """Format paginated response"""
+    def paginated_response(
+        items: List[Any],
+        total: Optional[int],
+        page: Optional[int],
+        page_size: int,
+        next_cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Format paginated response
+
+        Keyset-paginated endpoints pass next_cursor instead of a page number,
+        and may leave total as None when counting every row would cost more
+        than the page itself.
+        """
         return {
             "success": True,
             "data": items,
@@ -173,10 +293,25 @@ class ResponseFormatter:
                 "total": total,
                 "page": page,
                 "page_size": page_size,
-                "total_pages": (total + page_size - 1) // page_size
+                "total_pages": (total + page_size - 1) // page_size if total is not None else None,
+                "next_cursor": next_cursor
             }
         }
 
+    @staticmethod
+    def encode_cursor(last_id: int) -> str:
+        """Encode the last row id of a page as an opaque cursor"""
+        return base64.urlsafe_b64encode(str(last_id).encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Optional[int]:
+        """Decode a cursor from encode_cursor, None if it is malformed"""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            return int(base64.urlsafe_b64decode(padded.encode()).decode())
+        except (ValueError, UnicodeDecodeError):
+            return None
+
 class ConfigUtils:
     @staticmethod
     def get_config_value(key: str, default: Any = None) -> Any:
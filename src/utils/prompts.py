@@ -0,0 +1,184 @@
+import json
+import string
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from src.utils.tokens import estimate_message_tokens, estimate_tokens
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Shared by contract generation and the LangChain chat endpoints
+CADENCE_SYSTEM_PROMPT = """You are an expert Flow blockchain developer specializing in Cadence smart contracts.
+
+IMPORTANT: Always generate complete, production-ready Cadence smart contract code with:
+- Proper contract structure with pub fun init()
+- Resource definitions with proper interfaces
+- Access control (pub, access(all), etc.)
+- Error handling with pre and post conditions
+- Comments explaining key functionality
+- Proper import statements
+
+Always respond with:
+1. A clear explanation of what the contract does
+2. The complete Cadence code in a code block with ```cadence syntax
+3. Any deployment considerations or usage examples
+
+Focus on:
+- NFT contracts (NonFungibleToken standard)
+- Fungible Token contracts (FungibleToken standard)
+- Marketplace contracts
+- Staking contracts
+- DAO contracts
+- Simple utility contracts
+
+Never generate incomplete code snippets. Always provide full, deployable contracts."""
+
+CONTRACT_GUIDELINES = """Generate complete, secure, and efficient Cadence smart contracts based on user requirements.
+Follow Flow blockchain best practices and include proper access control, resource management,
+and error handling."""
+
+# Stable text first and variable text last, so consecutive requests share
+# the longest possible prefix for provider-side prompt caching
+CONTRACT_USER_TEMPLATE = """Generate a complete Cadence smart contract that meets the requirements at the end of this message.
+Include proper comments and documentation.
+{documentation}{context}
+Requirements: {requirements}"""
+
+CONTRACT_REPAIR_TEMPLATE = """The contract you returned fails validation:
+{errors}
+
+Fix these problems and return the complete corrected contract in a single ```cadence code block."""
+
+CHAT_SUMMARY_TEMPLATE = """Summarize this conversation between a user and a Cadence smart contract assistant so it can replace the original messages as context for later turns.
+Keep the user's requirements, decisions made, contract and function names, and any code details still relevant. Write at most 200 words.
+
+Summary so far: {previous_summary}
+
+Conversation:
+{transcript}"""
+
+def serialize_context(context: Optional[Dict[str, Any]]) -> str:
+    """Canonical JSON for prompt context: sorted keys, no None values, no whitespace"""
+    if not context:
+        return ""
+    return json.dumps(
+        {key: value for key, value in context.items() if value is not None},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str
+    )
+
+class PromptTemplate:
+    """A template compiled once into literal text and field names
+
+    Rendering joins the precomputed parts, and the token count of the
+    literal text is known up front.
+    """
+
+    def __init__(self, name: str, text: str):
+        self.name = name
+        self.text = text
+        self.parts: List[Tuple[str, Optional[str]]] = [
+            (literal, field) for literal, field, _, _ in string.Formatter().parse(text)
+        ]
+        self.fields = [field for _, field in self.parts if field]
+        self.static_text = "".join(literal for literal, _ in self.parts)
+        self.static_tokens = estimate_tokens(self.static_text)
+
+    @classmethod
+    def literal(cls, name: str, text: str) -> "PromptTemplate":
+        """A template with no fields, e.g. a prompt loaded from a file"""
+        return cls(name, text.replace("{", "{{").replace("}", "}}"))
+
+    def render(self, **values: str) -> str:
+        if not self.fields:
+            return self.static_text
+        return "".join(
+            literal + (str(values[field]) if field else "")
+            for literal, field in self.parts
+        )
+
+class PromptRegistry:
+    """Loads and compiles every prompt template once per process"""
+
+    def __init__(self, root: Path = PROJECT_ROOT):
+        self.root = root
+        self._templates: Optional[Dict[str, PromptTemplate]] = None
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> PromptTemplate:
+        templates = self._templates
+        if templates is None:
+            with self._lock:
+                if self._templates is None:
+                    self._templates = self._load()
+                templates = self._templates
+        return templates[name]
+
+    def _load(self) -> Dict[str, PromptTemplate]:
+        cadence_system = CADENCE_SYSTEM_PROMPT
+        chat_system = (self.root / "chat-system-prompt.md").read_text(encoding="utf-8").strip()
+
+        return {
+            "cadence_system": PromptTemplate.literal("cadence_system", cadence_system),
+            "chat_system": PromptTemplate.literal("chat_system", chat_system),
+            "contract_system": PromptTemplate.literal("contract_system", f"{cadence_system}\n\n{CONTRACT_GUIDELINES}"),
+            "contract_user": PromptTemplate("contract_user", CONTRACT_USER_TEMPLATE),
+            "contract_repair": PromptTemplate("contract_repair", CONTRACT_REPAIR_TEMPLATE),
+            "chat_summary": PromptTemplate("chat_summary", CHAT_SUMMARY_TEMPLATE)
+        }
+
+    def contract_messages(
+        self,
+        requirements: str,
+        context: Optional[Dict[str, Any]] = None,
+        documentation: Optional[List[Dict[str, Any]]] = None
+    ) -> Tuple[List[Dict[str, str]], Dict[str, int]]:
+        """Chat messages for a contract generation plus their estimated token counts"""
+        system = self.get("contract_system").render()
+
+        documentation_text = ""
+        if documentation:
+            sections = "\n\n".join(
+                f"[{number}] {chunk['title']}\n{chunk['content']}"
+                for number, chunk in enumerate(documentation, 1)
+            )
+            documentation_text = f"\nRelevant Flow documentation:\n\n{sections}\n"
+
+        serialized = serialize_context(context)
+        context_text = f"\nContext: {serialized}\n" if serialized else ""
+
+        user = self.get("contract_user").render(
+            documentation=documentation_text,
+            context=context_text,
+            requirements=requirements
+        )
+        messages = [
+            {"role": "system", "content": system},
+            {"role": "user", "content": user}
+        ]
+
+        counts = {
+            "system_tokens": self.get("contract_system").static_tokens,
+            "documentation_tokens": estimate_tokens(documentation_text),
+            "context_tokens": estimate_tokens(context_text),
+            "requirements_tokens": estimate_tokens(requirements),
+            "total_tokens": estimate_message_tokens(messages)
+        }
+        return messages, counts
+
+    def repair_messages(
+        self,
+        messages: List[Dict[str, str]],
+        response: str,
+        errors: List[str]
+    ) -> List[Dict[str, str]]:
+        """The original conversation plus the rejected answer and its validation errors"""
+        feedback = self.get("contract_repair").render(errors="\n".join(f"- {error}" for error in errors))
+        return messages + [
+            {"role": "assistant", "content": response},
+            {"role": "user", "content": feedback}
+        ]
+
+prompts = PromptRegistry()
@@ -0,0 +1,85 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+class RateLimitExceeded(Exception):
+    def __init__(self, quota: str, retry_after: float):
+        super().__init__(f"Rate limit exceeded for {quota}, retry in {retry_after:.0f}s")
+        self.quota = quota
+        self.retry_after = retry_after
+
+class GCRARateLimiter:
+    """Generic cell rate algorithm: `limit` calls per `window_seconds`, bursts allowed
+
+    Each key stores a single float (its theoretical arrival time), so a check
+    is O(1) and memory per key is fixed. Keys whose allowance has fully
+    refilled carry no state and are evicted lazily; max_keys bounds memory
+    even under key churn.
+    """
+
+    def __init__(self, limit: int, window_seconds: float, name: str = "requests", max_keys: int = 100000):
+        if limit <= 0 or window_seconds <= 0:
+            raise ValueError("limit and window_seconds must be positive")
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.name = name
+        self.max_keys = max_keys
+        self.emission_interval = window_seconds / limit
+        # Least recently updated first
+        self.arrivals: "OrderedDict[Hashable, float]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def acquire(self, key: Hashable, now: Optional[float] = None) -> float:
+        """Take one call for key; returns 0 if allowed, else seconds until it would be"""
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            self._evict(now)
+            arrival = max(self.arrivals.get(key, now), now)
+            allowed_at = arrival + self.emission_interval - self.window_seconds
+            if now < allowed_at:
+                return allowed_at - now
+
+            self.arrivals[key] = arrival + self.emission_interval
+            self.arrivals.move_to_end(key)
+            return 0.0
+
+    def is_allowed(self, key: Hashable) -> bool:
+        return self.acquire(key) == 0.0
+
+    def check(self, key: Hashable):
+        """Take one call for key or raise RateLimitExceeded"""
+        retry_after = self.acquire(key)
+        if retry_after:
+            raise RateLimitExceeded(self.name, retry_after)
+
+    def remaining(self, key: Hashable, now: Optional[float] = None) -> int:
+        """Calls key could make right now without being limited"""
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            arrival = max(self.arrivals.get(key, now), now)
+        return max(0, int((now + self.window_seconds - arrival) / self.emission_interval + 1e-9))
+
+    def _evict(self, now: float):
+        arrivals = self.arrivals
+        while arrivals:
+            key, arrival = next(iter(arrivals.items()))
+            if arrival > now and len(arrivals) <= self.max_keys:
+                break
+            arrivals.popitem(last=False)
+
+class QuotaRegistry:
+    """Named per-key-class limiters shared across the process"""
+
+    def __init__(self):
+        self.limiters: Dict[str, GCRARateLimiter] = {}
+        self.lock = threading.Lock()
+
+    def get(self, name: str, limit: int, window_seconds: float) -> GCRARateLimiter:
+        with self.lock:
+            limiter = self.limiters.get(name)
+            if limiter is None:
+                limiter = self.limiters[name] = GCRARateLimiter(limit, window_seconds, name=name)
+            return limiter
+
+quotas = QuotaRegistry()
@@ -1,9 +1,48 @@
 import secrets
 import hashlib
 import bcrypt
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, MultiFernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from src.config import settings
+from src.utils.rate_limit import GCRARateLimiter
+from collections import deque
+from functools import lru_cache
+from typing import List, Optional, Tuple
+import atexit
 import base64
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+ENCRYPTION_KEY_SALT = b"smart-contract-llm-builder"
+ENCRYPTION_KEY_INFO = b"sensitive-data-encryption"
+
+def derive_encryption_key(secret: str) -> bytes:
+    """Derive a Fernet key from a secret with HKDF-SHA256"""
+    key = HKDF(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=ENCRYPTION_KEY_SALT,
+        info=ENCRYPTION_KEY_INFO,
+    ).derive(secret.encode())
+    return base64.urlsafe_b64encode(key)
+
+def legacy_encryption_key(secret: str) -> bytes:
+    """Key used before HKDF derivation, kept so old ciphertexts still decrypt"""
+    return base64.urlsafe_b64encode(secret.encode()[:32].ljust(32, b'0'))
+
+@lru_cache(maxsize=4)
+def build_cipher(secrets_in_order: Tuple[str, ...]) -> MultiFernet:
+    """Build the cipher for secrets, newest first; only the first one encrypts"""
+    keys = [derive_encryption_key(secret) for secret in secrets_in_order]
+    keys += [legacy_encryption_key(secret) for secret in secrets_in_order]
+    return MultiFernet([Fernet(key) for key in keys])
 
 class SecurityUtils:
     @staticmethod
@@ -26,20 +65,44 @@ class SecurityUtils:
         """Verify data against its hash"""
         return hashlib.sha256(data.encode()).hexdigest() == hash_value
 
+    @staticmethod
+    def get_cipher() -> MultiFernet:
+        """Cached cipher for ENCRYPTION_SECRETS (falls back to the JWT secret)"""
+        secrets_in_order = tuple(settings.ENCRYPTION_SECRETS) or (settings.JWT_SECRET_KEY,)
+        return build_cipher(secrets_in_order)
+
     @staticmethod
     def encrypt_sensitive_data(data: str) -> str:
         """Encrypt sensitive data for storage"""
-        # Generate encryption key from JWT secret
-        key = base64.urlsafe_b64encode(settings.JWT_SECRET_KEY.encode()[:32].ljust(32, b'0'))
-        fernet = Fernet(key)
-        return fernet.encrypt(data.encode()).decode()
+        return SecurityUtils.get_cipher().encrypt(data.encode()).decode()
 
     @staticmethod
     def decrypt_sensitive_data(encrypted_data: str) -> str:
         """Decrypt sensitive data"""
-        key = base64.urlsafe_b64encode(settings.JWT_SECRET_KEY.encode()[:32].ljust(32, b'0'))
-        fernet = Fernet(key)
-        return fernet.decrypt(encrypted_data.encode()).decode()
+        return SecurityUtils.get_cipher().decrypt(encrypted_data.encode()).decode()
+
+    @staticmethod
+    def encrypt_many(values: List[str]) -> List[str]:
+        """Encrypt many values with one cipher lookup"""
+        encrypt = SecurityUtils.get_cipher().encrypt
+        return [encrypt(value.encode()).decode() for value in values]
+
+    @staticmethod
+    def decrypt_many(encrypted_values: List[str]) -> List[str]:
+        """Decrypt many values with one cipher lookup"""
+        decrypt = SecurityUtils.get_cipher().decrypt
+        return [decrypt(value.encode()).decode() for value in encrypted_values]
+
+    @staticmethod
+    def rotate_sensitive_data(encrypted_values: List[str]) -> List[str]:
+        """Re-encrypt stored values under the newest key, keeping their timestamps
+
+        Values already under an older secret or the legacy padded key are
+        decrypted with it; after rotating every stored value the old secret
+        can be removed from ENCRYPTION_SECRETS.
+        """
+        rotate = SecurityUtils.get_cipher().rotate
+        return [rotate(value.encode()).decode() for value in encrypted_values]
 
 class PasswordManager:
     @staticmethod
@@ -73,44 +136,50 @@ class InputValidator:
         sanitized = ''.join(c for c in sanitized if c.isalnum() or c in '._- ')
         return sanitized.strip()
 
-class RateLimiter:
+class RateLimiter(GCRARateLimiter):
     def __init__(self, max_calls: int = 60, window_seconds: int = 60):
+        super().__init__(max_calls, window_seconds)
         self.max_calls = max_calls
-        self.window_seconds = window_seconds
-        self.calls = {}
-
-    def is_allowed(self, identifier: str) -> bool:
-        """Check if request is allowed based on rate limit"""
-        import time
-
-        current_time = time.time()
-
-        # Clean up old calls
-        if identifier in self.calls:
-            self.calls[identifier] = [
-                call_time for call_time in self.calls[identifier]
-                if current_time - call_time < self.window_seconds
-            ]
 
-        # Check if limit exceeded
-        if identifier not in self.calls:
-            self.calls[identifier] = []
-
-        if len(self.calls[identifier]) >= self.max_calls:
-            return False
+class AuditLogger:
+    """Security audit log with an in-memory ring buffer and batched SQLite persistence
 
-        # Record this call
-        self.calls[identifier].append(current_time)
-        return True
+    log_security_event only appends to memory; a writer thread flushes pending
+    events to an indexed SQLite table every AUDIT_FLUSH_INTERVAL_SECONDS or
+    once AUDIT_BATCH_SIZE events are waiting. A batch that fails to write
+    stays pending and is retried with exponential backoff; at most
+    AUDIT_MAX_PENDING events wait, the oldest being dropped (and counted in
+    the log) beyond that. With an empty db_path the ring buffer is the only
+    store.
+    """
 
-class AuditLogger:
-    def __init__(self):
-        self.logs = []
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        buffer_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        max_pending: Optional[int] = None
+    ):
+        db_path = settings.AUDIT_DB_PATH if db_path is None else db_path
+        # Relative paths live in DATA_DIR, not wherever the process was started
+        self.db_path = os.path.join(settings.DATA_DIR, db_path) if db_path else ""
+        self.logs = deque(maxlen=buffer_size or settings.AUDIT_BUFFER_SIZE)
+        self.flush_interval = flush_interval or settings.AUDIT_FLUSH_INTERVAL_SECONDS
+        self.batch_size = batch_size or settings.AUDIT_BATCH_SIZE
+        self.pending = deque()
+        self.max_pending = max_pending or settings.AUDIT_MAX_PENDING
+        self.dropped = 0
+        self.max_retry_delay = settings.AUDIT_MAX_RETRY_SECONDS
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.stopping = threading.Event()
+        self.writer: Optional[threading.Thread] = None
+        self.connection: Optional[sqlite3.Connection] = None
+        self.closed = False
 
     def log_security_event(self, event_type: str, user_id: int = None, details: dict = None):
         """Log security events for auditing"""
-        import time
-
         log_entry = {
             'timestamp': time.time(),
             'event_type': event_type,
@@ -118,20 +187,187 @@ class AuditLogger:
             'details': details or {}
         }
 
+        # deque(maxlen=...) drops the oldest entry in O(1) once full
         self.logs.append(log_entry)
 
-        # In production, you'd want to persist this to a database
-        # For now, we'll keep it in memory
-        if len(self.logs) > 1000:  # Keep only last 1000 entries
-            self.logs = self.logs[-1000:]
+        if self.db_path and not self.closed:
+            self.pending.append(log_entry)
+            self._trim_pending()
+            if self.writer is None:
+                self._start_writer()
+            if len(self.pending) >= self.batch_size:
+                self.wakeup.set()
 
-    def get_security_logs(self, user_id: int = None, limit: int = 100) -> list:
-        """Get security logs, optionally filtered by user"""
-        logs = self.logs
+    def get_security_logs(
+        self,
+        user_id: int = None,
+        limit: int = 100,
+        event_type: str = None,
+        since: float = None,
+        until: float = None
+    ) -> list:
+        """Get security logs, optionally filtered by user, event type and time range"""
+        if not self.db_path:
+            return self._filter_buffer(user_id, limit, event_type, since, until)
+
+        self.flush()
+        clauses = []
+        params: list = []
         if user_id:
-            logs = [log for log in logs if log.get('user_id') == user_id]
+            clauses.append("user_id = ?")
+            params.append(user_id)
+        if event_type:
+            clauses.append("event_type = ?")
+            params.append(event_type)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(until)
+
+        query = "SELECT timestamp, event_type, user_id, details FROM audit_events"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY id DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self.lock:
+            rows = self._connect().execute(query, params).fetchall()
+
+        # Oldest first, like the in-memory log
+        return [
+            {
+                'timestamp': timestamp,
+                'event_type': event,
+                'user_id': user,
+                'details': json.loads(details) if details else {}
+            }
+            for timestamp, event, user, details in reversed(rows)
+        ]
 
+    def flush(self):
+        """Write all pending events to SQLite now"""
+        if not self.db_path:
+            return
+
+        with self.lock:
+            while self.pending:
+                batch = []
+                while self.pending and len(batch) < self.batch_size:
+                    batch.append(self.pending.popleft())
+                try:
+                    connection = self._connect()
+                    with connection:
+                        connection.executemany(
+                            "INSERT INTO audit_events (timestamp, event_type, user_id, details) VALUES (?, ?, ?, ?)",
+                            [
+                                (entry['timestamp'], entry['event_type'], entry['user_id'], json.dumps(entry['details'], default=str))
+                                for entry in batch
+                            ]
+                        )
+                except sqlite3.Error:
+                    # Put the batch back in order so the next flush retries it
+                    self.pending.extendleft(reversed(batch))
+                    self._trim_pending()
+                    raise
+
+    def close(self):
+        """Stop the writer thread after flushing what is pending"""
+        self.closed = True
+        self.stopping.set()
+        self.wakeup.set()
+        if self.writer is not None:
+            self.writer.join()
+            self.writer = None
+        try:
+            self.flush()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to persist {len(self.pending)} audit events on close: {str(e)}")
+        self._report_dropped()
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+    def _filter_buffer(self, user_id, limit, event_type, since, until) -> list:
+        logs = [
+            log for log in self.logs
+            if (not user_id or log.get('user_id') == user_id)
+            and (not event_type or log.get('event_type') == event_type)
+            and (since is None or log['timestamp'] >= since)
+            and (until is None or log['timestamp'] < until)
+        ]
         return logs[-limit:] if limit else logs
 
+    def _connect(self) -> sqlite3.Connection:
+        # Callers hold self.lock; the connection is shared with the writer thread
+        if self.connection is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            with self.connection:
+                self.connection.execute("PRAGMA journal_mode=WAL")
+                self.connection.execute(
+                    "CREATE TABLE IF NOT EXISTS audit_events ("
+                    "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                    "timestamp REAL NOT NULL, "
+                    "event_type TEXT NOT NULL, "
+                    "user_id INTEGER, "
+                    "details TEXT)"
+                )
+                self.connection.execute(
+                    "CREATE INDEX IF NOT EXISTS ix_audit_events_user_id_timestamp ON audit_events (user_id, timestamp)"
+                )
+                self.connection.execute(
+                    "CREATE INDEX IF NOT EXISTS ix_audit_events_event_type_timestamp ON audit_events (event_type, timestamp)"
+                )
+                self.connection.execute(
+                    "CREATE INDEX IF NOT EXISTS ix_audit_events_timestamp ON audit_events (timestamp)"
+                )
+        return self.connection
+
+    def _start_writer(self):
+        with self.lock:
+            if self.writer is not None:
+                return
+            self.writer = threading.Thread(target=self._run_writer, name="audit-log-writer", daemon=True)
+            self.writer.start()
+        atexit.register(self.close)
+
+    def _trim_pending(self):
+        # Oldest first; the writer may be draining the queue concurrently
+        while len(self.pending) > self.max_pending:
+            try:
+                self.pending.popleft()
+            except IndexError:
+                break
+            self.dropped += 1
+
+    def _report_dropped(self):
+        dropped, self.dropped = self.dropped, 0
+        if dropped:
+            logger.error(f"Dropped {dropped} audit events: more than {self.max_pending} were waiting to be written")
+
+    def _run_writer(self):
+        failures = 0
+        while not self.closed:
+            if failures:
+                # While SQLite is unavailable, a filling queue does not cut the backoff short
+                self.stopping.wait(min(self.flush_interval * 2 ** min(failures, 16), self.max_retry_delay))
+            else:
+                self.wakeup.wait(self.flush_interval)
+            self.wakeup.clear()
+            try:
+                self.flush()
+                failures = 0
+            except sqlite3.Error as e:
+                failures += 1
+                logger.error(f"Failed to persist audit events (attempt {failures}): {str(e)}")
+            self._report_dropped()
+
 # Initialize audit logger
-audit_logger = AuditLogger()
\ No newline at end of file
+audit_logger = AuditLogger()
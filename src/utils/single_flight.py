@@ -0,0 +1,55 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+class _Flight:
+    def __init__(self, key: Hashable, task: asyncio.Task):
+        self.key = key
+        self.task = task
+        self.waiters = 0
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one execution
+
+    The first caller for a key starts the work in its own task; callers that
+    arrive while it runs await the same result (or exception). The work is
+    cancelled only when every caller waiting on it has gone away. Nothing is
+    cached: once a flight finishes, the next call for its key starts anew.
+    """
+
+    def __init__(self):
+        self.flights: Dict[Hashable, _Flight] = {}
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Run fn once per key among concurrent callers; returns (result, shared)
+
+        shared is False for the caller whose call did the work and True for
+        callers that reused it.
+        """
+        flight = self.flights.get(key)
+        shared = flight is not None
+        if flight is None:
+            flight = self.flights[key] = _Flight(key, asyncio.ensure_future(fn()))
+            flight.task.add_done_callback(lambda _: self._forget(flight))
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task), shared
+        finally:
+            self._leave(flight)
+
+    def _forget(self, flight: _Flight):
+        if self.flights.get(flight.key) is flight:
+            del self.flights[flight.key]
+
+    def _leave(self, flight: _Flight):
+        flight.waiters -= 1
+        if flight.waiters == 0 and not flight.task.done():
+            # Nobody wants the result; later callers must not join a cancelled flight
+            self._forget(flight)
+            flight.task.cancel()
+
+    def in_flight(self) -> int:
+        return len(self.flights)
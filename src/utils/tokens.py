@@ -0,0 +1,42 @@
+import math
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None
+
+# Rough characters per token for English prose and code
+CHARS_PER_TOKEN = 4
+# Per-message framing tokens in chat completions
+MESSAGE_OVERHEAD_TOKENS = 4
+REPLY_PRIMING_TOKENS = 3
+
+@lru_cache(maxsize=16)
+def _encoding_for(model: str):
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # Encodings are downloaded on first use and may be unavailable offline
+        return None
+
+def estimate_tokens(text: str, model: Optional[str] = None) -> int:
+    """Count tokens with tiktoken when available, else estimate from length"""
+    if not text:
+        return 0
+    encoding = _encoding_for(model or "gpt-4")
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+def estimate_message_tokens(messages: List[Dict[str, str]], model: Optional[str] = None) -> int:
+    """Estimate prompt tokens for a list of chat messages"""
+    return sum(
+        estimate_tokens(message.get("content") or "", model) + MESSAGE_OVERHEAD_TOKENS
+        for message in messages
+    ) + REPLY_PRIMING_TOKENS
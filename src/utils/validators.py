@@ -1,9 +1,35 @@
 from typing import Dict, Any, Optional
+from collections import OrderedDict
+import hashlib
 import re
 from pydantic import validator, EmailStr
 from pydantic import BaseModel
+from src.utils.cadence import CadenceAnalyzer
 
 class ContractValidator:
+    # Analysis results keyed by SHA-256 of the contract source
+    _analysis_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+    _analysis_cache_size = 512
+
+    @staticmethod
+    def analyze_cadence_contract(contract_code: str) -> Dict[str, Any]:
+        """Return the structural summary of a Cadence contract, memoized by code hash
+
+        The cached summary is shared between callers and must not be mutated.
+        """
+        cache = ContractValidator._analysis_cache
+        key = hashlib.sha256(contract_code.encode('utf-8')).hexdigest()
+        summary = cache.get(key)
+        if summary is not None:
+            cache.move_to_end(key)
+            return summary
+
+        summary = CadenceAnalyzer.analyze(contract_code)
+        cache[key] = summary
+        if len(cache) > ContractValidator._analysis_cache_size:
+            cache.popitem(last=False)
+        return summary
+
     @staticmethod
     def validate_cadence_contract(contract_code: str) -> Dict[str, Any]:
         """Validate Cadence smart contract syntax and structure"""
@@ -14,28 +40,54 @@ class ContractValidator:
         if not contract_code.strip():
             errors.append("Contract code cannot be empty")
 
+        summary = ContractValidator.analyze_cadence_contract(contract_code)
+        keywords = set(summary["keywords"])
+        errors.extend(summary["syntax_errors"])
+
         # Check for required Cadence keywords
         required_keywords = ['pub', 'contract', 'let', 'fun']
         for keyword in required_keywords:
-            if keyword not in contract_code:
+            if keyword not in keywords:
                 warnings.append(f"Missing keyword: {keyword}")
 
         # Check for proper contract structure
-        if 'contract' not in contract_code:
+        if not summary["contracts"] and not summary["contract_interfaces"]:
             errors.append("No contract definition found")
 
         # Check for resource management
-        if 'resource' not in contract_code:
+        if not summary["resources"] and not summary["resource_interfaces"]:
             warnings.append("No resources defined - consider using resources for asset management")
 
         # Check for access control
-        if 'access(' not in contract_code:
+        if not any(modifier.startswith('access(') for modifier in summary["access_modifiers"]):
             warnings.append("No access control defined - consider adding access modifiers")
 
         # Check for error handling
-        if 'panic' not in contract_code and 'pre' not in contract_code:
+        if not summary["panic_calls"] and not summary["pre_conditions"]:
             warnings.append("No error handling found - consider adding pre-conditions")
 
+        return {
+            "is_valid": len(errors) == 0,
+            "errors": errors,
+            "warnings": warnings,
+            "summary": summary
+        }
+
+    @staticmethod
+    def validate_solidity_contract(contract_code: str) -> Dict[str, Any]:
+        """Run basic structural checks on a Solidity contract"""
+        errors = []
+        warnings = []
+
+        if not contract_code.strip():
+            errors.append("Contract code cannot be empty")
+
+        if not re.search(r'^\s*pragma\s+solidity\b', contract_code, re.MULTILINE):
+            warnings.append("No pragma solidity version directive found")
+
+        if not re.search(r'\b(contract|library|interface)\s+\w+', contract_code):
+            errors.append("No contract definition found")
+
         return {
             "is_valid": len(errors) == 0,
             "errors": errors,
@@ -92,34 +144,62 @@ class UserValidator:
         valid_personas = ['DEVELOPER', 'DESIGNER', 'PRODUCT_MANAGER', 'BUSINESS_ANALYST']
         return persona_type.upper() in valid_personas
 
+# Characters stripped by InputSanitizer and the patterns it uses, compiled once
+_UNSAFE_CHARS_TABLE = str.maketrans('', '', '<>"\'')
+_WHITESPACE_RUN = re.compile(r'\s+')
+# Matches an unsafe character, any whitespace other than a plain space
+# (the str.isspace set, spelled out so the scan is a single character class)
+# or a run of spaces
+_NEEDS_SANITIZING = re.compile(
+    '[<>"\'\t\n\x0b\x0c\r\x1c-\x1f\x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000]|  '
+)
+
 class InputSanitizer:
+    # Strings up to this length are checked first and returned as-is when clean;
+    # longer ones skip the check since it would usually be followed by a rewrite
+    FAST_PATH_MAX_LENGTH = 4096
+
     @staticmethod
     def sanitize_string(input_string: str) -> str:
         """Sanitize string input to prevent injection attacks"""
+        if (
+            len(input_string) <= InputSanitizer.FAST_PATH_MAX_LENGTH
+            and input_string[:1] != ' ' and input_string[-1:] != ' '
+            and not _NEEDS_SANITIZING.search(input_string)
+        ):
+            return input_string
+
         # Remove potentially dangerous characters
-        sanitized = input_string.strip()
-        sanitized = re.sub(r'[<>"\']', '', sanitized)
-        sanitized = re.sub(r'\s+', ' ', sanitized)  # Normalize whitespace
-        return sanitized
+        sanitized = input_string.strip().translate(_UNSAFE_CHARS_TABLE)
+        return _WHITESPACE_RUN.sub(' ', sanitized)  # Normalize whitespace
 
     @staticmethod
     def sanitize_json_input(json_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Sanitize JSON input"""
-        sanitized = {}
-        for key, value in json_data.items():
-            if isinstance(value, str):
-                sanitized[key] = InputSanitizer.sanitize_string(value)
-            elif isinstance(value, dict):
-                sanitized[key] = InputSanitizer.sanitize_json_input(value)
-            elif isinstance(value, list):
-                sanitized[key] = [
-                    InputSanitizer.sanitize_json_input(item) if isinstance(item, dict)
-                    else InputSanitizer.sanitize_string(item) if isinstance(item, str)
-                    else item
-                    for item in value
-                ]
-            else:
-                sanitized[key] = value
+        """Sanitize JSON input
+
+        Nested dicts and lists are walked with an explicit stack, so deeply
+        nested payloads cannot hit the recursion limit.
+        """
+        sanitize_string = InputSanitizer.sanitize_string
+        sanitized: Dict[str, Any] = {}
+        stack = [(json_data, sanitized)]
+
+        while stack:
+            source, target = stack.pop()
+            items = source.items() if isinstance(source, dict) else enumerate(source)
+            for key, value in items:
+                if isinstance(value, str):
+                    value = sanitize_string(value)
+                elif isinstance(value, dict):
+                    child = {}
+                    stack.append((value, child))
+                    value = child
+                elif isinstance(value, list):
+                    child = [None] * len(value)
+                    stack.append((value, child))
+                    value = child
+                target[key] = value
+
         return sanitized
 
 # Pydantic models for validation
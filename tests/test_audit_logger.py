@@ -0,0 +1,23 @@
+import sqlite3
+import pytest
+from src.utils.security import AuditLogger
+
+def test_pending_events_are_capped_while_writes_fail(tmp_path):
+    audit = AuditLogger(db_path=str(tmp_path / "audit.db"), flush_interval=60, batch_size=1000, max_pending=5)
+    audit.log_security_event("login", 0)
+    audit.flush()
+    # Reject every insert so nothing leaves the queue
+    audit.connection.execute("DROP TABLE audit_events")
+    audit.connection.execute("CREATE TABLE audit_events (timestamp REAL CHECK (timestamp < 0), event_type TEXT, user_id INTEGER, details TEXT)")
+
+    for user_id in range(1, 13):
+        audit.log_security_event("login", user_id)
+    assert [event["user_id"] for event in audit.pending] == [8, 9, 10, 11, 12]
+    assert audit.dropped == 7
+
+    with pytest.raises(sqlite3.Error):
+        audit.flush()
+    assert len(audit.pending) == 5
+
+    audit.close()
+    assert audit.dropped == 0
@@ -0,0 +1,48 @@
+import asyncio
+from src.services.chat_history import ChatHistoryManager
+
+class RecordingSummarizer:
+    def __init__(self):
+        self.prompts = []
+
+    async def __call__(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        return f"summary {len(self.prompts)}"
+
+def test_oversized_last_turn_is_sent_without_summarizing():
+    history = ChatHistoryManager(token_budget=100)
+    summarize = RecordingSummarizer()
+    messages = [{"role": "user", "content": "word " * 600}]
+
+    for _ in range(2):
+        summary, turns = asyncio.run(history.prepare(messages, "conversation", summarize, owner=1))
+        assert summary is None
+        assert turns == messages
+
+    assert summarize.prompts == []
+
+def test_older_turns_are_summarized_once_and_reused():
+    history = ChatHistoryManager(token_budget=200)
+    summarize = RecordingSummarizer()
+    messages = []
+    for index in range(6):
+        messages.append({"role": "user", "content": f"question {index} " + "word " * 20})
+        messages.append({"role": "assistant", "content": f"answer {index} " + "word " * 20})
+    messages.append({"role": "user", "content": "last question"})
+
+    summary, turns = asyncio.run(history.prepare(messages, "conversation", summarize, owner=1))
+    assert summary == "summary 1"
+    assert turns[-1] == messages[-1]
+    assert len(turns) < len(messages)
+
+    # The same history reuses the cached summary
+    again, _ = asyncio.run(history.prepare(messages, "conversation", summarize, owner=1))
+    assert again == "summary 1"
+    assert len(summarize.prompts) == 1
+
+    # Another caller, or an edited history, never gets that summary
+    other, _ = asyncio.run(history.prepare(messages, "conversation", summarize, owner=2))
+    assert other == "summary 2"
+    edited = [{"role": "user", "content": "changed"}] + messages[1:]
+    fresh, _ = asyncio.run(history.prepare(edited, "conversation", summarize, owner=1))
+    assert fresh == "summary 3"
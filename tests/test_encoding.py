@@ -0,0 +1,13 @@
+import json
+from src.api.encoding import EncodedMessage, TokenDeltaEncoder, dumps_json
+
+def test_dumps_json_accepts_non_string_keys():
+    data = {"counts": {1: 2, 3: 4}, "id": 7}
+    assert json.loads(dumps_json(data)) == json.loads(json.dumps(data))
+    assert json.loads(EncodedMessage({"type": "stats", "data": data}).text)["data"]["counts"] == {"1": 2, "3": 4}
+
+def test_token_deltas_send_only_new_text():
+    encoder = TokenDeltaEncoder(ttl_seconds=60, max_streams=10)
+    assert encoder.encode("s", "he") == {"offset": 0, "delta": "he", "reset": False}
+    assert encoder.encode("s", "hello") == {"offset": 2, "delta": "llo"}
+    assert encoder.encode("s", "other") == {"offset": 0, "delta": "other", "reset": True}
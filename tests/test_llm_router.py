@@ -0,0 +1,84 @@
+import asyncio
+from typing import Any, Dict, List
+from src.services.llm_router import LLMProvider, ProviderRouter
+
+MESSAGES = [{"role": "user", "content": "Write a counter contract"}]
+
+class FakeProvider(LLMProvider):
+    """Answers after delay seconds, or raises when fail is set; records calls and cancellations"""
+
+    def __init__(self, name: str, delay: float = 0.0, fail: bool = False):
+        super().__init__(name, f"{name.lower()}-model")
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = 0
+
+    async def complete(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise RuntimeError(f"{self.name} unavailable")
+        return {
+            "content": f"answer from {self.name}",
+            "provider": self.name,
+            "model": self.model,
+            "prompt_tokens": 10,
+            "completion_tokens": 20,
+            "estimated": False
+        }
+
+def test_failover_follows_candidate_order():
+    first, second, third = FakeProvider("A", fail=True), FakeProvider("B", fail=True), FakeProvider("C")
+    router = ProviderRouter([first, second, third], hedge=False, failure_threshold=1, cooldown_seconds=60)
+
+    result = asyncio.run(router.complete(MESSAGES))
+    assert result["provider"] == "C"
+    assert [first.calls, second.calls, third.calls] == [1, 1, 1]
+
+    # Failed providers cool down, so the next call goes straight to the healthy one
+    assert router.candidates() == ["C", "A", "B"]
+    assert asyncio.run(router.complete(MESSAGES))["provider"] == "C"
+    assert [first.calls, second.calls, third.calls] == [1, 1, 2]
+
+def test_failover_starts_with_the_preferred_provider():
+    first, second = FakeProvider("A"), FakeProvider("B", fail=True)
+    router = ProviderRouter([first, second], hedge=False)
+
+    result = asyncio.run(router.complete(MESSAGES, preferred="B"))
+    assert result["provider"] == "A"
+    assert [first.calls, second.calls] == [1, 1]
+    assert router.stats["B"].failures == 1
+
+def test_stalled_primary_is_hedged_cancelled_and_billed():
+    stalled, fast = FakeProvider("A", delay=10), FakeProvider("B", delay=0.01)
+    router = ProviderRouter([stalled, fast], hedge=True, min_hedge_delay=0.05)
+
+    async def scenario():
+        result = await router.complete(MESSAGES)
+        # Let the cancellation reach the losing call
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        # Checked before asyncio.run cancels whatever is left over
+        assert stalled.cancelled == 1
+        assert fast.cancelled == 0
+        return result
+
+    result = asyncio.run(scenario())
+    assert result["provider"] == "B"
+
+    # The cancelled call is still charged for, as an estimate
+    [hedged] = result["hedged"]
+    assert hedged["provider"] == "A"
+    assert hedged["model"] == "a-model"
+    assert hedged["completion_tokens"] == result["completion_tokens"]
+    assert hedged["prompt_tokens"] > 0
+    assert hedged["estimated"] is True
+
+    # Its elapsed time still counts towards A's latency, without a failure
+    assert router.stats["A"].measured
+    assert router.stats["A"].failures == 0
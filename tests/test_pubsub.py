@@ -0,0 +1,92 @@
+import asyncio
+from src.api.pubsub import RESPConnection, RedisPubSub
+
+class RESPStub:
+    """In-process server speaking just enough RESP for SUBSCRIBE and PUBLISH"""
+
+    def __init__(self):
+        self.server = None
+        self.subscribers = {}
+        self.connections = set()
+        self.subscriptions = 0
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self.serve, "127.0.0.1", 0)
+        host, port = self.server.sockets[0].getsockname()[:2]
+        return f"redis://{host}:{port}/0"
+
+    async def stop(self):
+        self.drop_connections()
+        self.server.close()
+        await self.server.wait_closed()
+
+    def drop_connections(self):
+        for writer in list(self.connections):
+            writer.close()
+        self.connections.clear()
+        self.subscribers.clear()
+
+    async def serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections.add(writer)
+        connection = RESPConnection("redis://stub")
+        connection.reader = reader
+        try:
+            while True:
+                command = await connection.read_reply()
+                name = command[0].decode().upper()
+                if name == "SUBSCRIBE":
+                    channel = command[1].decode()
+                    self.subscribers.setdefault(channel, []).append(writer)
+                    self.subscriptions += 1
+                    writer.write(b"*3\r\n$9\r\nsubscribe\r\n" + self.bulk(channel) + b":1\r\n")
+                elif name == "PUBLISH":
+                    channel, message = command[1].decode(), command[2].decode()
+                    receivers = self.subscribers.get(channel, [])
+                    for receiver in receivers:
+                        receiver.write(b"*3\r\n$7\r\nmessage\r\n" + self.bulk(channel) + self.bulk(message))
+                    writer.write(b":%d\r\n" % len(receivers))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections.discard(writer)
+            writer.close()
+
+    @staticmethod
+    def bulk(text: str) -> bytes:
+        data = text.encode()
+        return b"$%d\r\n%s\r\n" % (len(data), data)
+
+async def wait_for(condition, timeout: float = 2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.01)
+
+def test_subscriber_and_publisher_reconnect_after_a_dropped_connection():
+    async def scenario():
+        stub = RESPStub()
+        url = await stub.start()
+        backend = RedisPubSub(url, reconnect_delay=0.01)
+        received = []
+
+        async def handler(channel: str, message: str):
+            received.append((channel, message))
+
+        try:
+            await backend.start("events", handler)
+            await backend.publish("events", "before")
+            await wait_for(lambda: len(received) == 1)
+
+            stub.drop_connections()
+            # The listener subscribes again, and publish reopens its connection
+            await wait_for(lambda: stub.subscriptions == 2)
+            await backend.publish("events", "after")
+            await wait_for(lambda: len(received) == 2)
+        finally:
+            await backend.stop()
+            await stub.stop()
+
+        assert received == [("events", "before"), ("events", "after")]
+
+    asyncio.run(scenario())
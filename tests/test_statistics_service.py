@@ -0,0 +1,29 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from src.models import contract, user  # noqa: F401 (registers the tables)
+from src.models.contract import UserStatistics
+from src.models.database import Base
+from src.services.statistics_service import StatisticsService
+
+def test_first_write_creates_the_counters_row(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'stats.db'}")
+    Base.metadata.create_all(engine)
+    service = StatisticsService()
+
+    with Session(engine) as db:
+        assert service.get_user_statistics(db, 1)["total_submissions"] == 0
+        assert db.get(UserStatistics, 1) is None
+
+        service.record_submission(db, 1)
+        service.record_deployment(db, 1, succeeded=True, gas_used=40)
+        service.record_deployment(db, 1, succeeded=False)
+        db.commit()
+
+    with Session(engine) as db:
+        assert service.get_user_statistics(db, 1) == {
+            "total_submissions": 1,
+            "total_deployments": 2,
+            "successful_deployments": 1,
+            "total_gas_used": 40,
+            "success_rate": 0.5
+        }